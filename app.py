@@ -1,100 +1,137 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import asyncio
 import logging
-import sys
-import json
-from google.adk.sessions import InMemorySessionService
-from google.adk.runners import Runner
-from google.genai import types
-from root_agent.agent import root_agent
-
-# === Initial Session State ===
-initial_state = {
-    "tool": [],       # Multiple tools supported
-    "role": "",
-    "team": "",
-    "project": ""
-}
+from chat_service import INVALID_BODY, SSE_HEADERS, ChatService, configure_logging, format_sse, readiness
+from root_agent.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, collect_timings, render_metrics, server_timing, span
 
 # === Initialize Flask App ===
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})  # Enable CORS
 
 # === Setup Logging ===
-logger = logging.getLogger()
-logger.setLevel(logging.DEBUG)
-handler = logging.StreamHandler(sys.stdout)
-formatter = logging.Formatter(
-    "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
-)
-handler.setFormatter(formatter)
-logger.handlers = [handler]
+configure_logging()
 
 logging.info("🔹 Flask app starting...")
 
 # === Setup Session Service ===
-session_service = InMemorySessionService()
-session = session_service.create_session(app_name="Navo", user_id="user1", state=initial_state)
-SESSION_ID = session.id
-logging.info(f"🔹 Session created with ID: {SESSION_ID}")
+chat_service = ChatService()
+
+# === Optional Index Warm-up ===
+chat_service.start_warmup()
+
+
+# === Readiness Endpoint ===
+@app.route("/navo/ready", methods=["GET"])
+def ready():
+    payload, is_ready = readiness()
+    return jsonify(payload), (200 if is_ready else 503)
+
+
+# === Cache Stats Endpoint ===
+@app.route("/navo/stats", methods=["GET"])
+def stats():
+    return jsonify(chat_service.stats())
+
+
+# === Prometheus Metrics Endpoint ===
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    return Response(render_metrics(), content_type=METRICS_CONTENT_TYPE)
 
 
 # === Chat Endpoint ===
 @app.route("/navo/chat", methods=["POST"])
 def chat():
+    # Spans of this request (agent setup, model/tool calls, embedding, search) → Server-Timing
+    with collect_timings() as timings:
+        response, status = _chat()
+    response.headers["Server-Timing"] = server_timing(timings)
+    return response, status
+
+
+def _request_body():
+    """The request's JSON object, or None if the body is missing, malformed or not an object."""
+    body = request.get_json(silent=True)
+    return body if isinstance(body, dict) else None
+
+
+def _chat():
     try:
+        body = _request_body()
+        if body is None:
+            return jsonify({"reply": INVALID_BODY}), 400
         # Log full request JSON
-        logging.debug(f"📥 Incoming request: {request.json}")
+        logging.debug(f"📥 Incoming request: {body}")
 
-        user_query = request.json.get("query", "")
-        preferences = request.json.get("preferences", {})  # Optional preferences
+        user_query = body.get("query", "")
+        preferences = body.get("preferences", {})  # Optional preferences
+        user_id = body.get("user_id")  # Optional; defaults to the shared user
+        session_id = body.get("session_id")  # Optional; one default session per user
 
         logging.info(f"📌 User query: {user_query}")
         logging.info(f"📌 User preferences: {preferences}")
 
-        # Update session state with preferences
-        if preferences:
-            session.state.update({
-                "tool": preferences.get("tool", []),
-                "role": preferences.get("role", ""),
-                "team": preferences.get("team", ""),
-                "project": preferences.get("project", "")
-            })
-            logging.info(f"🔄 Updated session preferences: {session.state}")
+        # Update this user's session state with preferences
+        session = chat_service.get_session(user_id, session_id)
+        session = chat_service.apply_preferences(session, preferences)
 
         if not user_query:
             return jsonify({"reply": "❗ No query provided."}), 400
 
-        # Prepare content for agent
-
-        query_text = user_query
-        if preferences:
-            query_text += f"\nPreferences: {json.dumps(preferences)}"
-        logging.debug(f"📥 Incoming user query: {query_text}")
-        content = types.Content(role="user", parts=[types.Part(text=query_text)])
-        root_agent_instance = root_agent(session=session)
-        
-        runner = Runner(agent=root_agent_instance, app_name="Navo", session_service=session_service)
-
-        # Async call wrapper
-        async def run_runner():   
-            async for event in runner.run_async(user_id="user1", session_id=SESSION_ID, new_message=content):
-                if event.is_final_response() and event.content and event.content.parts:
-                    final_text = event.content.parts[0].text.strip()
-                    logging.debug(f"📤 Agent final response: {final_text}")
-                    return final_text
-            return "⚠️ No final response from agent."
-
-        response_text = asyncio.run(run_runner())
+        # Flask views are synchronous: run the turn on a short-lived event loop.
+        # Use asgi_app.py for a persistent loop.
+        with span("chat"):
+            response_text = asyncio.run(chat_service.chat(session, user_query, preferences))
         logging.info(f"✅ Sending response: {response_text}")
-        return jsonify({"reply": response_text})
+        with span("serialize"):
+            return jsonify({"reply": response_text, "user_id": session.user_id, "session_id": session.id}), 200
 
     except Exception as e:
         logging.exception("❌ Error during chat processing")
         return jsonify({"reply": f"❌ Error: {str(e)}"}), 500
 
 
+# === Streaming Chat Endpoint (Server-Sent Events) ===
+@app.route("/navo/chat/stream", methods=["POST"])
+def chat_stream():
+    # Errors before the stream starts get the same JSON replies as /navo/chat
+    try:
+        body = _request_body()
+        if body is None:
+            return jsonify({"reply": INVALID_BODY}), 400
+        user_query = body.get("query", "")
+        preferences = body.get("preferences", {})  # Optional preferences
+        logging.info(f"📌 User query (stream): {user_query}")
+
+        session = chat_service.get_session(body.get("user_id"), body.get("session_id"))
+        session = chat_service.apply_preferences(session, preferences)
+    except Exception as e:
+        logging.exception("❌ Error during chat processing")
+        return jsonify({"reply": f"❌ Error: {str(e)}"}), 500
+
+    if not user_query:
+        return jsonify({"reply": "❗ No query provided."}), 400
+
+    def frames():
+        # Flask streams from a sync generator: drive the async stream on a private loop
+        loop = asyncio.new_event_loop()
+        events = chat_service.stream_chat(session, user_query, preferences)
+        try:
+            yield format_sse({"type": "session", "user_id": session.user_id, "session_id": session.id})
+            while True:
+                try:
+                    event = loop.run_until_complete(events.__anext__())
+                except StopAsyncIteration:
+                    break
+                yield format_sse(event)
+        finally:
+            loop.run_until_complete(events.aclose())
+            loop.close()
+
+    return Response(stream_with_context(frames()), mimetype="text/event-stream", headers=SSE_HEADERS)
+
+
 # === Entry Point ===
 if __name__ == "__main__":
     logging.info("🔹 Running Flask app on port 5000...")
@@ -0,0 +1,140 @@
+"""
+ASGI entry point for Navo: same endpoints and contract as app.py, served from
+one persistent event loop. The root agent's Runner is awaited directly and
+the blocking fetch_* tools run in a bounded thread pool (NAVO_TOOL_WORKERS).
+
+Run with:
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+"""
+import logging
+
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from chat_service import INVALID_BODY, SSE_HEADERS, ChatService, configure_logging, format_sse, readiness
+from root_agent.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, collect_timings, render_metrics, server_timing, span
+
+# === Setup Logging ===
+configure_logging()
+
+logging.info("🔹 ASGI app starting...")
+
+# === Setup Session Service ===
+chat_service = ChatService()
+
+
+async def ready(request: Request):
+    payload, is_ready = readiness()
+    return JSONResponse(payload, status_code=200 if is_ready else 503)
+
+
+async def stats(request: Request):
+    return JSONResponse(chat_service.stats())
+
+
+async def metrics(request: Request):
+    return Response(render_metrics(), headers={"Content-Type": METRICS_CONTENT_TYPE})
+
+
+async def chat(request: Request):
+    # Spans of this request (agent setup, model/tool calls, embedding, search) → Server-Timing
+    with collect_timings() as timings:
+        response = await _chat(request)
+    response.headers["Server-Timing"] = server_timing(timings)
+    return response
+
+
+async def _request_body(request: Request):
+    """The request's JSON object, or None if the body is malformed or not an object."""
+    try:
+        body = await request.json()
+    except ValueError:
+        return None
+    return body if isinstance(body, dict) else None
+
+
+async def _chat(request: Request):
+    try:
+        body = await _request_body(request)
+        if body is None:
+            return JSONResponse({"reply": INVALID_BODY}, status_code=400)
+        logging.debug(f"📥 Incoming request: {body}")
+
+        user_query = body.get("query", "")
+        preferences = body.get("preferences", {})  # Optional preferences
+        user_id = body.get("user_id")  # Optional; defaults to the shared user
+        session_id = body.get("session_id")  # Optional; one default session per user
+
+        logging.info(f"📌 User query: {user_query}")
+        logging.info(f"📌 User preferences: {preferences}")
+
+        # Update this user's session state with preferences
+        session = chat_service.get_session(user_id, session_id)
+        session = chat_service.apply_preferences(session, preferences)
+
+        if not user_query:
+            return JSONResponse({"reply": "❗ No query provided."}, status_code=400)
+
+        with span("chat"):
+            response_text = await chat_service.chat(session, user_query, preferences)
+        logging.info(f"✅ Sending response: {response_text}")
+        with span("serialize"):
+            return JSONResponse({"reply": response_text, "user_id": session.user_id, "session_id": session.id})
+
+    except Exception as e:
+        logging.exception("❌ Error during chat processing")
+        return JSONResponse({"reply": f"❌ Error: {str(e)}"}, status_code=500)
+
+
+async def chat_stream(request: Request):
+    # Errors before the stream starts get the same JSON replies as /navo/chat
+    try:
+        body = await _request_body(request)
+        if body is None:
+            return JSONResponse({"reply": INVALID_BODY}, status_code=400)
+        user_query = body.get("query", "")
+        preferences = body.get("preferences", {})  # Optional preferences
+        logging.info(f"📌 User query (stream): {user_query}")
+
+        session = chat_service.get_session(body.get("user_id"), body.get("session_id"))
+        session = chat_service.apply_preferences(session, preferences)
+    except Exception as e:
+        logging.exception("❌ Error during chat processing")
+        return JSONResponse({"reply": f"❌ Error: {str(e)}"}, status_code=500)
+
+    if not user_query:
+        return JSONResponse({"reply": "❗ No query provided."}, status_code=400)
+
+    async def frames():
+        yield format_sse({"type": "session", "user_id": session.user_id, "session_id": session.id})
+        async for event in chat_service.stream_chat(session, user_query, preferences):
+            yield format_sse(event)
+
+    return StreamingResponse(frames(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+app = Starlette(
+    routes=[
+        Route("/navo/chat", chat, methods=["POST"]),
+        Route("/navo/chat/stream", chat_stream, methods=["POST"]),
+        Route("/navo/ready", ready, methods=["GET"]),
+        Route("/navo/stats", stats, methods=["GET"]),
+        Route("/metrics", metrics, methods=["GET"]),
+    ],
+    middleware=[
+        Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"]),
+    ],
+    on_startup=[chat_service.start_warmup],
+)
+
+
+# === Entry Point ===
+if __name__ == "__main__":
+    import uvicorn
+
+    logging.info("🔹 Running ASGI app on port 5000...")
+    uvicorn.run(app, host="0.0.0.0", port=5000, log_config=None)
@@ -0,0 +1,74 @@
+# benchmarks/compare.py
+"""
+Compare two retrieval_benchmark.py result files (e.g. main vs. a branch).
+Prints the relative change of every metric for each (index, records,
+concurrency) present in both, and exits non-zero when any metric regressed
+by more than --fail-above percent.
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json --fail-above 10
+"""
+
+import argparse
+import json
+import sys
+
+# Metric -> True when higher is better
+BUILD_METRICS = {"records_per_second": True, "peak_rss_bytes": False}
+QUERY_METRICS = {"qps": True, "p50_ms": False, "p95_ms": False, "p99_ms": False}
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def rows(report):
+    """Flatten a report into {(index, records, phase): {metric: value}}."""
+    flat = {}
+    for result in report["results"]:
+        key = (result["index"], result["records"])
+        flat[key + ("build",)] = {metric: result["build"].get(metric) for metric in BUILD_METRICS}
+        for level in result.get("query", []):
+            flat[key + (f"c={level['concurrency']}",)] = {metric: level.get(metric) for metric in QUERY_METRICS}
+    return flat
+
+
+def compare(base, head):
+    """Yield (key, metric, base value, head value, change %, regressed %)."""
+    base_rows, head_rows = rows(base), rows(head)
+    for key in sorted(set(base_rows) & set(head_rows), key=str):
+        metrics = BUILD_METRICS if key[2] == "build" else QUERY_METRICS
+        for metric, higher_is_better in metrics.items():
+            before, after = base_rows[key][metric], head_rows[key][metric]
+            if not before or after is None:
+                continue
+            change = (after - before) / before * 100
+            regression = -change if higher_is_better else change
+            yield key, metric, before, after, round(change, 1), round(regression, 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two retrieval benchmark result files.")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--fail-above", type=float, default=None, help="Fail on a regression above this percent")
+    args = parser.parse_args(argv)
+
+    base, head = load(args.base), load(args.head)
+    print(f"base {base['meta'].get('commit')} → head {head['meta'].get('commit')}")
+    failed = []
+    for (index, records, phase), metric, before, after, change, regression in compare(base, head):
+        flag = ""
+        if args.fail_above is not None and regression > args.fail_above:
+            flag = "  ❌"
+            failed.append((index, records, phase, metric))
+        print(f"{index:22} {records:>9} {phase:>6} {metric:18} {before:>14} → {after:<14} {change:+.1f}%{flag}")
+    if failed:
+        print(f"{len(failed)} metric(s) regressed by more than {args.fail_above}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
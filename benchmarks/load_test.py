@@ -0,0 +1,193 @@
+# benchmarks/load_test.py
+"""
+Open-loop load generator for /navo/chat. Requests are issued on a fixed
+schedule at the target rate regardless of how fast the server answers, each
+with a tool preference drawn from the configured mix, and latency is counted
+from the scheduled send time so server stalls are not hidden by client
+back-off. Reports throughput, latency percentiles and error rates overall and
+per mix entry, plus the server's /navo/stats after the run.
+
+Run the server against the offline stub model so no Gemini calls are made:
+    NAVO_LLM_BACKEND=stub NAVO_STUB_LLM_LATENCY_MS=300 python app.py
+    python -m benchmarks.load_test --url http://localhost:5000 --rps 20 --duration 60 \\
+        --mix none=4,github=2,jira=1,servicenow=1,github+jira=1 --users 50
+
+Queries are distinct, but with NAVO_RESPONSE_CACHE=true on the server the
+first question of each user's session may still hit the semantic response
+cache; leave it off to measure the full pipeline.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from .stats import git_commit, latency_summary
+from .synthetic import queries
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+# Replies the chat endpoint returns with HTTP 200 that are still failures
+ERROR_REPLY_PREFIXES = {"❌": "agent_error", "⚠️ No final response": "no_response"}
+
+
+def parse_mix(text):
+    """'none=4,github=2,github+jira=1' -> [(label, tools, weight)]."""
+    mix = []
+    for entry in text.split(","):
+        label, _, weight = entry.strip().partition("=")
+        tools = [] if label == "none" else label.split("+")
+        mix.append((label, tools, float(weight or 1)))
+    return mix
+
+
+def build_plan(args):
+    """Deterministic list of (label, payload) for every request of the run."""
+    rng = random.Random(f"load:{args.seed}")
+    mix = parse_mix(args.mix)
+    total = int(args.rps * args.duration)
+    plan = []
+    for i, query in enumerate(queries(total, seed=args.seed)):
+        label, tools, _ = rng.choices(mix, weights=[weight for _, _, weight in mix])[0]
+        payload = {"query": query, "preferences": {"tool": tools}, "user_id": f"load-user-{i % args.users}"}
+        plan.append((label, payload))
+    return plan
+
+
+def post_json(url, payload, timeout):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return response.status, json.loads(response.read().decode("utf-8"))
+
+
+def classify(status, body):
+    if status != 200:
+        return f"http_{status}"
+    reply = (body or {}).get("reply") or ""
+    for prefix, kind in ERROR_REPLY_PREFIXES.items():
+        if reply.startswith(prefix):
+            return kind
+    return None
+
+
+def send(url, payload, scheduled_at, timeout):
+    """Returns (error kind or None, latency from schedule, service time)."""
+    sent_at = time.perf_counter()
+    try:
+        status, body = post_json(url, payload, timeout)
+        error = classify(status, body)
+    except urllib.error.HTTPError as e:
+        error = f"http_{e.code}"
+    except Exception as e:
+        error = type(e).__name__
+    finished = time.perf_counter()
+    return error, finished - scheduled_at, finished - sent_at
+
+
+def summarize(outcomes, duration):
+    errors = Counter(error for error, _, _ in outcomes if error)
+    ok = [(latency, service) for error, latency, service in outcomes if not error]
+    return {
+        "requests": len(outcomes),
+        "ok": len(ok),
+        "errors": dict(errors),
+        "error_rate": round(sum(errors.values()) / len(outcomes), 4) if outcomes else 0.0,
+        "throughput_rps": round(len(ok) / duration, 2) if duration else None,
+        "latency": latency_summary([latency for latency, _ in ok]),
+        "service_time": latency_summary([service for _, service in ok]),
+    }
+
+
+def run(args):
+    chat_url = args.url.rstrip("/") + "/navo/chat"
+    plan = build_plan(args)
+    outcomes = defaultdict(list)
+    lock = threading.Lock()
+    inflight = threading.BoundedSemaphore(args.max_inflight)
+    dropped = Counter()
+
+    def worker(label, payload, scheduled_at):
+        try:
+            outcome = send(chat_url, payload, scheduled_at, args.timeout)
+        finally:
+            inflight.release()
+        with lock:
+            outcomes[label].append(outcome)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.max_inflight) as pool:
+        for i, (label, payload) in enumerate(plan):
+            scheduled_at = started + i / args.rps
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if not inflight.acquire(blocking=False):
+                # Client at its in-flight cap: count it instead of silently slowing the schedule
+                dropped[label] += 1
+                continue
+            pool.submit(worker, label, payload, scheduled_at)
+    elapsed = time.perf_counter() - started
+
+    all_outcomes = [outcome for label_outcomes in outcomes.values() for outcome in label_outcomes]
+    report = {
+        "offered_rps": args.rps,
+        "elapsed_seconds": round(elapsed, 3),
+        "dropped": sum(dropped.values()),
+        "overall": summarize(all_outcomes, elapsed),
+        "by_mix": {
+            label: {**summarize(label_outcomes, elapsed), "dropped": dropped[label]}
+            for label, label_outcomes in sorted(outcomes.items())
+        },
+    }
+    try:
+        with urllib.request.urlopen(args.url.rstrip("/") + "/navo/stats", timeout=args.timeout) as response:
+            report["server_stats"] = json.loads(response.read().decode("utf-8"))
+    except Exception as e:
+        report["server_stats"] = {"error": str(e)}
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open-loop load generator for /navo/chat.")
+    parser.add_argument("--url", default="http://localhost:5000")
+    parser.add_argument("--rps", type=float, default=10.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load to offer")
+    parser.add_argument("--mix", default="none=1", help="Weighted tool preferences, e.g. none=4,github=2,github+jira=1")
+    parser.add_argument("--users", type=int, default=1, help="Distinct user_ids (each gets its own session)")
+    parser.add_argument("--max-inflight", type=int, default=256, help="Client cap on concurrent requests")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Results file (default: benchmarks/results/load-<time>-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "args": {key: value for key, value in vars(args).items() if key != "output"},
+        },
+        **run(args),
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit or 'nocommit'}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps({key: report[key] for key in ("offered_rps", "dropped", "overall", "by_mix")}, indent=2))
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+# benchmarks/retrieval_benchmark.py
+"""
+Offline retrieval benchmark for VectorDBAgent. For each index and corpus size
+it builds a throwaway Chroma collection from synthetic records (see
+synthetic.py) and measures build throughput, single-client query latency
+(p50/p95/p99), QPS at each concurrency level and peak RSS. Results are
+written as JSON tagged with the git commit; compare runs with compare.py.
+
+The default stub embedding needs no network or model download, so timings
+isolate chunking, Chroma and retrieval overhead. --embed hf uses the real
+sentence-transformer instead (it must already be in the local cache).
+
+Usage:
+    python -m benchmarks.retrieval_benchmark --sizes 1k,10k
+    python -m benchmarks.retrieval_benchmark --indexes servicenow_incidents --sizes 100k,1m --concurrency 1,8,32
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import psutil
+
+from root_agent.tools.embedding_registry import DEFAULT_EMBED_MODEL, query_embedding_cache, register_embed_model
+from root_agent.tools.index_registry import get_index
+# Importing the tool modules registers their indexes (formatters, id fields)
+from root_agent.tools import github_tool, jira_tool, confluence_tool, servicenow_tool  # noqa: F401
+
+from .stats import git_commit, latency_summary
+from .stub_embedding import STUB_EMBED_MODEL, StubEmbedding
+from .synthetic import GENERATORS, queries
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+SIZE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_size(text):
+    text = text.strip().lower()
+    if text[-1:] in SIZE_SUFFIXES:
+        return int(float(text[:-1]) * SIZE_SUFFIXES[text[-1]])
+    return int(text)
+
+
+class PeakRss:
+    """Samples this process's RSS in a background thread; `peak` is the high-water mark."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.start_rss = self.peak = self.process.memory_info().rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+
+
+def run_queries(agent, query_list, top_k, concurrency):
+    """Run every query once with `concurrency` client threads; returns (latencies, wall seconds)."""
+    def timed(query):
+        started = time.perf_counter()
+        agent.query(query, top_k=top_k)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        latencies = [timed(query) for query in query_list]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            latencies = list(pool.map(timed, query_list))
+    return latencies, time.perf_counter() - started
+
+
+def bench_index(index_name, size, args, embed_model_name, workdir):
+    persist_dir = tempfile.mkdtemp(prefix=f"{index_name}_{size}_", dir=workdir)
+    result = {"index": index_name, "records": size}
+    try:
+        with PeakRss() as build_rss:
+            agent = get_index(index_name).create(
+                collection_name=f"bench_{index_name}",
+                persist_dir=persist_dir,
+                record_loader=lambda: GENERATORS[index_name](size, seed=args.seed),
+                embed_model_name=embed_model_name,
+                index_mode="open",
+                batch_size=args.batch_size,
+            )
+            build = agent.ingest()
+        result["build"] = {
+            **build,
+            "peak_rss_bytes": build_rss.peak,
+            "rss_delta_bytes": build_rss.peak - build_rss.start_rss,
+        }
+
+        query_list = list(queries(args.queries, seed=args.seed))
+        # Warm the retriever and Chroma's segment cache before timing
+        for query in query_list[:args.warmup]:
+            agent.query(query, top_k=args.top_k)
+
+        result["query"] = []
+        with PeakRss() as query_rss:
+            for concurrency in args.concurrency:
+                if not args.query_cache:
+                    # Every timed query embeds afresh, as a distinct user query would
+                    query_embedding_cache.clear()
+                latencies, wall = run_queries(agent, query_list, args.top_k, concurrency)
+                result["query"].append({
+                    "concurrency": concurrency,
+                    "queries": len(latencies),
+                    "qps": round(len(latencies) / wall, 2) if wall else None,
+                    **latency_summary(latencies),
+                })
+                logger.info(f"⏱️ {index_name} @ {size} records, concurrency {concurrency}: {result['query'][-1]}")
+        result["query_peak_rss_bytes"] = query_rss.peak
+        result["disk_bytes"] = sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, names in os.walk(persist_dir) for name in names
+        )
+    finally:
+        if not args.keep:
+            shutil.rmtree(persist_dir, ignore_errors=True)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline VectorDBAgent build/query benchmark.")
+    parser.add_argument("--indexes", default="all", help=f"Comma-separated subset of {', '.join(GENERATORS)}")
+    parser.add_argument("--sizes", default="1k,10k", help="Corpus sizes, e.g. 1k,10k,100k,1m")
+    parser.add_argument("--queries", type=int, default=200, help="Distinct queries per concurrency level")
+    parser.add_argument("--concurrency", default="1,4,16", help="Client thread counts for the QPS runs")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--warmup", type=int, default=10, help="Untimed queries before measuring")
+    parser.add_argument("--batch-size", type=int, default=None, help="Ingest batch size (default: ingest_batch_size)")
+    parser.add_argument("--embed", choices=["stub", "hf"], default="stub")
+    parser.add_argument("--query-cache", action="store_true", help="Keep the query embedding cache between levels")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=None, help="Where temporary Chroma stores are created")
+    parser.add_argument("--keep", action="store_true", help="Keep the Chroma stores after the run")
+    parser.add_argument("--output", default=None, help="Results file (default: benchmarks/results/<time>-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    index_names = list(GENERATORS) if args.indexes == "all" else [name.strip() for name in args.indexes.split(",")]
+    unknown = [name for name in index_names if name not in GENERATORS]
+    if unknown:
+        parser.error(f"Unknown index(es) {unknown}; expected some of {list(GENERATORS)}")
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+    args.concurrency = [int(level) for level in args.concurrency.split(",")]
+
+    if args.embed == "stub":
+        embed_model_name = STUB_EMBED_MODEL
+        register_embed_model(STUB_EMBED_MODEL, StubEmbedding(model_name=STUB_EMBED_MODEL))
+    else:
+        embed_model_name = DEFAULT_EMBED_MODEL
+
+    commit = git_commit()
+    report = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "embed_model": embed_model_name,
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "workdir")},
+        },
+        "results": [],
+    }
+    for index_name in index_names:
+        for size in sizes:
+            logger.info(f"🏗️ Benchmarking {index_name} with {size} records")
+            report["results"].append(bench_index(index_name, size, args, embed_model_name, args.workdir))
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit or 'nocommit'}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report["results"], indent=2))
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+# benchmarks/stats.py
+"""Helpers shared by the benchmark scripts: latency percentiles and run metadata."""
+
+import math
+import os
+import subprocess
+
+
+def percentile(sorted_values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(p / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def latency_summary(latencies):
+    """p50/p95/p99/mean/max in milliseconds for latencies given in seconds."""
+    values = sorted(latencies)
+    if not values:
+        return {}
+    summary = {
+        f"{name}_ms": round(percentile(values, p) * 1000, 3)
+        for name, p in (("p50", 50), ("p95", 95), ("p99", 99))
+    }
+    summary["mean_ms"] = round(sum(values) / len(values) * 1000, 3)
+    summary["max_ms"] = round(values[-1] * 1000, 3)
+    return summary
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(__file__),
+        ).stdout.strip()
+    except Exception:
+        return None
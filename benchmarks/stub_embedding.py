@@ -0,0 +1,44 @@
+# benchmarks/stub_embedding.py
+"""
+Deterministic, dependency-free embedding for offline benchmarks. Tokens are
+feature-hashed into a fixed number of signed buckets and the vector is
+L2-normalized, so texts sharing words still land near each other and
+retrieval does real work, without downloading or running a model.
+"""
+
+import hashlib
+import math
+import re
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+
+STUB_EMBED_MODEL = "stub/hashing-384"
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def hashing_vector(text, dimensions=384):
+    vector = [0.0] * dimensions
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        digest = int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+        vector[digest % dimensions] += 1.0 if (digest >> 63) else -1.0
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+class StubEmbedding(BaseEmbedding):
+    """Feature-hashing embedding with the same dimensionality as all-MiniLM-L6-v2."""
+
+    dimensions: int = 384
+
+    @classmethod
+    def class_name(cls):
+        return "StubEmbedding"
+
+    def _get_query_embedding(self, query):
+        return hashing_vector(query, self.dimensions)
+
+    async def _aget_query_embedding(self, query):
+        return hashing_vector(query, self.dimensions)
+
+    def _get_text_embedding(self, text):
+        return hashing_vector(text, self.dimensions)
@@ -0,0 +1,239 @@
+# benchmarks/synthetic.py
+"""
+Seeded generators of synthetic records shaped like the data/ fixtures, one
+per index. Records are yielded lazily so a 1M-record run never holds the
+whole corpus in memory; the same (count, seed) always yields the same records.
+"""
+
+import random
+from datetime import datetime, timedelta
+
+SERVICES = [
+    "Flight Status API", "Booking Service", "Payment Gateway", "Cargo Tracking",
+    "Customs Clearance", "Notification Service", "Pricing Engine", "Auth Service",
+    "Shipment Manifest", "Invoice Export", "Warehouse Sync", "Rate Calculator",
+]
+PROBLEMS = [
+    "expired SSL certificate", "database connection pool exhaustion", "Kafka consumer lag",
+    "retry storm after timeout", "memory leak in worker", "slow query on shipments table",
+    "misconfigured load balancer", "OAuth token refresh failure", "disk full on log volume",
+    "race condition in booking updates", "stale cache entries", "rate limit exceeded upstream",
+]
+FIXES = [
+    "renewed the certificate and restarted the gateway", "raised the pool size and added a circuit breaker",
+    "scaled consumers and tuned the batch size", "added exponential backoff with jitter",
+    "patched the worker and added memory alerts", "added a composite index",
+    "corrected the health check path", "rotated client credentials", "added log rotation",
+    "wrapped the update in a transaction", "shortened the cache TTL", "requested a higher quota",
+]
+PEOPLE = [
+    ("Alice Johnson", "Project Manager"), ("Bob Smith", "Backend Developer"),
+    ("Carol Lee", "DevOps Engineer"), ("David Kim", "Frontend Developer"),
+    ("Eve Martinez", "Senior Developer"), ("Frank Wilson", "QA Engineer"),
+    ("Grace Kim", "Support Engineer"), ("Henry Patel", "Architect"),
+]
+TEAMS = [f"Team{n:03d}" for n in range(1, 9)]
+PROJECTS = [f"Project{n:03d}" for n in range(1, 5)]
+PR_STATUSES = ["Open", "Merged", "Closed"]
+ISSUE_STATUSES = ["To Do", "In Progress", "Done", "Blocked"]
+INCIDENT_STATUSES = ["New", "In Progress", "Resolved", "Closed"]
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+ISSUE_TYPES = ["Epic", "Story", "Bug", "Task"]
+FILE_TYPES = {"py": "python", "java": "java", "sql": "sql", "yaml": "config"}
+QUERY_TEMPLATES = [
+    "Why did the {service} go down?",
+    "{service} {problem} root cause",
+    "Find PRs that fixed {problem} in {service}",
+    "Show tickets about {problem}",
+    "How was the {service} incident with {problem} resolved?",
+    "Architecture docs for {service}",
+]
+BASE_TIME = datetime(2024, 1, 1)
+
+
+def _timestamp(rng, after=None):
+    start = after or BASE_TIME
+    return start + timedelta(minutes=rng.randint(1, 60 * 24 * (2 if after else 365)))
+
+
+def _iso(moment):
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _person(rng):
+    name, role = rng.choice(PEOPLE)
+    return {"name": name, "role": role, "email": f"{name.lower().replace(' ', '.')}@airfreight.com"}
+
+
+def _scenario(rng):
+    service, problem, fix = rng.choice(SERVICES), rng.choice(PROBLEMS), rng.choice(FIXES)
+    return service, problem, fix, rng.choice(TEAMS), rng.choice(PROJECTS)
+
+
+def github_prs(count, seed=0):
+    rng = random.Random(f"github_prs:{seed}")
+    for n in range(count):
+        service, problem, fix, team, project = _scenario(rng)
+        created = _timestamp(rng)
+        author = _person(rng)
+        status = rng.choice(PR_STATUSES)
+        yield {
+            "pr_id": f"PR-{100000 + n}",
+            "title": f"Fix {problem} in {service}",
+            "description": f"The {service} failed because of {problem}; this change {fix}.",
+            "created_by": author,
+            "created_at": _iso(created),
+            "status": status,
+            "merge_requested_by": _person(rng)["name"],
+            "merged_at": _iso(_timestamp(rng, created)) if status == "Merged" else None,
+            "linked_incident": f"INC-{rng.randint(1000, 99999)}",
+            "commits": [
+                {"commit_id": f"{rng.getrandbits(28):07x}", "message": f"{fix.capitalize()} ({i + 1})",
+                 "author": author["name"], "timestamp": _iso(_timestamp(rng, created))}
+                for i in range(rng.randint(1, 4))
+            ],
+            "team": team,
+            "project": project,
+            "repo": service.lower().replace(" ", "-"),
+        }
+
+
+def github_discussions(count, seed=0):
+    rng = random.Random(f"github_discussions:{seed}")
+    for n in range(count):
+        service, problem, fix, team, project = _scenario(rng)
+        yield {
+            "id": f"DISC-{100000 + n}",
+            "title": f"How should {service} handle {problem}?",
+            "details": f"We keep seeing {problem} in {service}. Proposal: {fix}. Thoughts on rollout?",
+            "created_by": _person(rng),
+            "created_at": _iso(_timestamp(rng)),
+            "status": rng.choice(["Open", "Answered", "Closed"]),
+            "team": team,
+            "project": project,
+        }
+
+
+def github_files(count, seed=0):
+    rng = random.Random(f"github_files:{seed}")
+    for n in range(count):
+        service, problem, fix, team, project = _scenario(rng)
+        extension = rng.choice(list(FILE_TYPES))
+        module = service.lower().replace(" ", "_")
+        lines = [f"# {service}: guard against {problem}"] + [
+            f"def step_{i}_{module}(request):  # {rng.choice(FIXES)}" for i in range(rng.randint(5, 30))
+        ]
+        yield {
+            "path": f"src/{module}/module_{n}.{extension}",
+            "repository": service.lower().replace(" ", "-"),
+            "type": FILE_TYPES[extension],
+            "content": "\n".join(lines),
+            "team": team,
+            "project": project,
+        }
+
+
+def jira_issues(count, seed=0):
+    rng = random.Random(f"jira_issues:{seed}")
+    for n in range(count):
+        service, problem, fix, team, project = _scenario(rng)
+        created = _timestamp(rng)
+        status = rng.choice(ISSUE_STATUSES)
+        yield {
+            "jira_id": f"JIRA-{100000 + n}",
+            "title": f"{service}: {problem}",
+            "description": f"Investigate {problem} affecting {service}. Suggested fix: {fix}.",
+            "linked_incident": f"INC-{rng.randint(1000, 99999)}",
+            "linked_git_pr": f"PR-{rng.randint(100000, 999999)}",
+            "priority": rng.choice(PRIORITIES),
+            "criticalness": rng.choice(PRIORITIES),
+            "status": status,
+            "type": rng.choice(ISSUE_TYPES),
+            "assignee": _person(rng)["name"],
+            "reporter": _person(rng)["name"],
+            "created_at": _iso(created),
+            "resolved_at": _iso(_timestamp(rng, created)) if status == "Done" else None,
+            "comments": [
+                {"commented_by": person["name"], "role": person["role"], "comment": f"Checked {service}; {fix}."}
+                for person in (_person(rng) for _ in range(rng.randint(0, 3)))
+            ],
+            "team": team,
+            "project": project,
+        }
+
+
+def confluence_pages(count, seed=0):
+    rng = random.Random(f"confluence_pages:{seed}")
+    for n in range(count):
+        service, problem, fix, team, project = _scenario(rng)
+        kind = rng.choice(["Architecture", "Runbook", "Design Doc", "Postmortem", "Onboarding"])
+        paragraphs = [
+            f"{service} overview and responsibilities for {team}.",
+            f"Known failure mode: {problem}. Standard mitigation: {fix}.",
+        ] + [f"Section {i + 1}: operating {service} with {rng.choice(PROBLEMS)} in mind." for i in range(rng.randint(2, 12))]
+        yield {
+            "id": f"PAGE-{100000 + n}",
+            "title": f"{service} {kind} {n}",
+            "content": "\n\n".join(paragraphs),
+            "created_by": _person(rng)["name"],
+            "created_at": _iso(_timestamp(rng)),
+            "labels": [kind.lower().replace(" ", "-"), service.lower().split()[0]],
+            "team": team,
+            "project": project,
+        }
+
+
+def servicenow_incidents(count, seed=0):
+    rng = random.Random(f"servicenow_incidents:{seed}")
+    for n in range(count):
+        service, problem, fix, team, project = _scenario(rng)
+        created = _timestamp(rng)
+        resolver = _person(rng)
+        yield {
+            "id": f"INC-{100000 + n}",
+            "title": f"{service} outage",
+            "description": f"{service} was unavailable for {rng.randint(5, 240)} minutes due to {problem}.",
+            "status": rng.choice(INCIDENT_STATUSES),
+            "importance": rng.choice(PRIORITIES),
+            "created_at": _iso(created),
+            "resolved_at": _iso(_timestamp(rng, created)),
+            "created_by": _person(rng),
+            "resolved_by": resolver,
+            "root_cause": f"{problem.capitalize()} in {service}.",
+            "resolution": f"{fix.capitalize()}.",
+            "steps_followed": [f"Checked {service} dashboards.", f"Confirmed {problem}.", f"{fix.capitalize()}."],
+            "comment_history": [
+                {"commented_by": person["name"], "role": person["role"],
+                 "comment": f"Update on {service}: {rng.choice(FIXES)}.", "timestamp": _iso(_timestamp(rng, created))}
+                for person in (_person(rng) for _ in range(rng.randint(1, 4)))
+            ],
+            "linked_resources": [
+                {"type": "PR", "id": f"PR-{rng.randint(100000, 999999)}", "url": "https://github.example/pr"}
+            ],
+            "team": team,
+            "project": project,
+        }
+
+
+# Index name (see index_registry) -> generator
+GENERATORS = {
+    "github_prs": github_prs,
+    "github_discussions": github_discussions,
+    "github_files": github_files,
+    "jira_issues": jira_issues,
+    "confluence_pages": confluence_pages,
+    "servicenow_incidents": servicenow_incidents,
+}
+
+
+def queries(count, seed=0):
+    """`count` distinct natural-language queries over the same vocabulary as the records."""
+    rng = random.Random(f"queries:{seed}")
+    seen = set()
+    while len(seen) < count:
+        query = rng.choice(QUERY_TEMPLATES).format(service=rng.choice(SERVICES), problem=rng.choice(PROBLEMS))
+        if query in seen:
+            # Template space is finite; vary the wording for large query sets
+            query = f"{query} (case {len(seen)})"
+        seen.add(query)
+        yield query
@@ -0,0 +1,259 @@
+"""
+Chat logic shared by the Flask app (app.py) and the ASGI app (asgi_app.py).
+The web layers only parse requests and serialize replies.
+"""
+import json
+import logging
+import sys
+from contextlib import aclosing
+
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events import Event, EventActions
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+from root_agent.agent import get_runner
+from root_agent.config.config_loader import get_bool_setting, get_int_setting, get_list_setting
+from root_agent.tools.index_registry import index_status, is_warming_up, warm_up
+from root_agent.tools.embedding_registry import embedding_memory_report, query_embedding_cache
+from root_agent.tools.response_cache import lookup_response, response_cache, store_response
+from root_agent.tools.result_cache import result_cache
+from root_agent.tools.router import warm_up_router
+from root_agent.tools.tool_executor import offload
+from root_agent.tools.speculation import activate, deactivate, iterate_with_turn, speculation_stats, start_speculation
+from session_store import DEFAULT_MAX_SESSION_BYTES, SessionStore
+from conversation_memory import STATE_KEY as MEMORY_STATE_KEY, ConversationMemory
+
+APP_NAME = "Navo"
+USER_ID = "user1"
+NO_RESPONSE = "⚠️ No final response from agent."
+INVALID_BODY = "❗ Request body must be a JSON object."
+
+# === Initial Session State ===
+initial_state = {
+    "tool": [],       # Multiple tools supported
+    "role": "",
+    "team": "",
+    "project": ""
+}
+
+
+def configure_logging():
+    logger = logging.getLogger()
+    logger.setLevel(logging.DEBUG)
+    handler = logging.StreamHandler(sys.stdout)
+    formatter = logging.Formatter(
+        "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+    )
+    handler.setFormatter(formatter)
+    logger.handlers = [handler]
+
+
+class ChatService:
+    """Owns the session service and runs one chat turn through the root agent."""
+
+    def __init__(self):
+        self.session_service = InMemorySessionService()
+        self.sessions = SessionStore(
+            self.session_service,
+            APP_NAME,
+            initial_state,
+            max_sessions=get_int_setting("max_sessions", 1000),
+            max_bytes=get_int_setting("max_session_bytes", DEFAULT_MAX_SESSION_BYTES),
+        )
+
+    def start_warmup(self):
+        # Indexes are otherwise built on first use; warm-up loads warmup_order's sources first.
+        # (No session exists yet at startup, so there are no tool preferences to go by.)
+        if get_bool_setting("warmup"):
+            warm_up(preferred_sources=get_list_setting("warmup_order"))
+        # The router's embedding model and centroids would otherwise load on the first request
+        warm_up_router()
+
+    def get_session(self, user_id=None, session_id=None):
+        return self.sessions.get_or_create(user_id or USER_ID, session_id)
+
+    def apply_preferences(self, session, preferences):
+        """Persist preferences into the stored session and return the refreshed session."""
+        if not preferences:
+            return session
+        state_delta = {
+            "tool": preferences.get("tool", []),
+            "role": preferences.get("role", ""),
+            "team": preferences.get("team", ""),
+            "project": preferences.get("project", "")
+        }
+        # get_session returns a copy; state changes only persist through an event
+        self.session_service.append_event(
+            session, Event(author="user", actions=EventActions(state_delta=state_delta))
+        )
+        logging.info(f"🔄 Updated session preferences for {session.user_id}/{session.id}: {session.state}")
+        return session
+
+    @staticmethod
+    def _build_content(session, user_query, preferences):
+        query_text = user_query
+        if get_bool_setting("conversation_memory", True):
+            # Summary + recent turns under a token budget instead of the full event history
+            query_text = ConversationMemory.from_state(session.state).render(user_query)
+        if preferences:
+            query_text += f"\nPreferences: {json.dumps(preferences)}"
+        logging.debug(f"📥 Incoming user query: {query_text}")
+        return types.Content(role="user", parts=[types.Part(text=query_text)])
+
+    @staticmethod
+    def _has_context(session):
+        """True once the session has earlier turns, which the response cache key does not capture."""
+        memory = ConversationMemory.from_state(session.state)
+        if memory.turns or memory.summary:
+            return True
+        return any(event.content and event.content.parts for event in session.events)
+
+    def _lookup_cached(self, session, user_query):
+        """(answer, probe) from the response cache; (None, None) for follow-up turns."""
+        if self._has_context(session):
+            return None, None
+        return lookup_response(user_query, session.state)
+
+    async def chat(self, session, user_query, preferences):
+        """Run one turn in `session` and return the agent's final text."""
+        with self.sessions.in_use(session):
+            return await self._chat(session, user_query, preferences)
+
+    async def _chat(self, session, user_query, preferences):
+        # A near-duplicate question with the same preferences is answered without the agents
+        cached, probe = await offload(self._lookup_cached)(session, user_query)
+        if cached:
+            self._finish_turn(session, user_query, cached)
+            return cached
+
+        content = self._build_content(session, user_query, preferences)
+        # Agent graph and Runner are shared by all sessions with the same tool selection
+        runner = await offload(get_runner)(session, APP_NAME, self.session_service, query=user_query)
+
+        # Opt-in: search likely sources while the first model call is in flight
+        turn = await offload(start_speculation)(session.state, user_query)
+        token = activate(turn)
+
+        final_text = None
+        try:
+            async for event in runner.run_async(user_id=session.user_id, session_id=session.id, new_message=content):
+                if event.is_final_response() and event.content and event.content.parts:
+                    final_text = event.content.parts[0].text.strip()
+                    logging.debug(f"📤 Agent final response: {final_text}")
+                    break
+            store_response(probe, final_text)
+        finally:
+            deactivate(token, turn)
+            self._finish_turn(session, user_query, final_text)
+        return final_text or NO_RESPONSE
+
+    async def stream_chat(self, session, user_query, preferences):
+        """
+        Run one turn with model streaming enabled and yield UI events as dicts:
+        {"type": "text", "text"} for partial model text, {"type": "tool_start", "name", "args"},
+        {"type": "tool_end", "name"}, and finally {"type": "final", "text"}
+        (or {"type": "error", "message"}). A cached answer is sent as a single
+        {"type": "final", "text", "cached": True}.
+        """
+        # aclosing: a client that disconnects still runs the turn's cleanup before release
+        with self.sessions.in_use(session):
+            async with aclosing(self._stream_chat(session, user_query, preferences)) as events:
+                async for event in events:
+                    yield event
+
+    async def _stream_chat(self, session, user_query, preferences):
+        cached, probe = await offload(self._lookup_cached)(session, user_query)
+        if cached:
+            try:
+                yield {"type": "final", "text": cached, "cached": True}
+            finally:
+                self._finish_turn(session, user_query, cached)
+            return
+
+        content = self._build_content(session, user_query, preferences)
+        runner = await offload(get_runner)(session, APP_NAME, self.session_service, query=user_query)
+        run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+        turn = await offload(start_speculation)(session.state, user_query)
+
+        final_text = None
+        try:
+            events = runner.run_async(
+                user_id=session.user_id, session_id=session.id, new_message=content, run_config=run_config
+            )
+            async for event in iterate_with_turn(turn, events):
+                for call in event.get_function_calls():
+                    yield {"type": "tool_start", "agent": event.author, "name": call.name, "args": call.args or {}}
+                for response in event.get_function_responses():
+                    yield {"type": "tool_end", "agent": event.author, "name": response.name}
+                if event.partial:
+                    text = "".join(part.text for part in (event.content.parts if event.content else []) if part.text)
+                    if text:
+                        yield {"type": "text", "agent": event.author, "text": text}
+                elif event.is_final_response() and event.content and event.content.parts:
+                    # The aggregated final event repeats the streamed text; send it once as the answer
+                    final_text = (event.content.parts[0].text or "").strip()
+                    logging.debug(f"📤 Agent final response: {final_text}")
+                    break
+            store_response(probe, final_text)
+            yield {"type": "final", "text": final_text or NO_RESPONSE}
+        except Exception as e:
+            logging.exception("❌ Error during streamed chat processing")
+            yield {"type": "error", "message": str(e)}
+        finally:
+            if turn is not None:
+                turn.finish()
+            self._finish_turn(session, user_query, final_text)
+
+    def _finish_turn(self, session, user_query, final_text):
+        if final_text and get_bool_setting("conversation_memory", True):
+            memory = ConversationMemory.from_state(session.state)
+            memory.add_turn(user_query, final_text)
+            self.session_service.append_event(
+                session, Event(author="user", actions=EventActions(state_delta={MEMORY_STATE_KEY: memory.to_dict()}))
+            )
+            # The memory now carries this turn; its raw events would only grow the next prompt
+            self.sessions.prune_events(session)
+        self._record(session)
+
+    def _record(self, session):
+        # Re-read the stored session so its size includes this turn's events
+        stored = self.session_service.get_session(
+            app_name=APP_NAME, user_id=session.user_id, session_id=session.id
+        )
+        if stored is not None:
+            self.sessions.record(stored)
+
+    def stats(self):
+        return {**stats(), "sessions": self.sessions.stats()}
+
+
+def format_sse(event):
+    """Serialize a stream_chat event as one Server-Sent Events frame."""
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+# Disable proxy buffering so frames reach the client as they are produced
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def readiness():
+    """Return (payload, is_ready) for the readiness endpoint."""
+    indexes = index_status()
+    warming_up = is_warming_up()
+    failed = [name for name, status in indexes.items() if status["state"] == "failed"]
+    is_ready = not warming_up and not failed
+    return {
+        "ready": is_ready,
+        "warming_up": warming_up,
+        "indexes": indexes,
+        "embedding_models": embedding_memory_report(),
+    }, is_ready
+
+
+def stats():
+    return {
+        "query_embedding_cache": query_embedding_cache.stats(),
+        "result_cache": result_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "speculation": speculation_stats.stats(),
+    }
@@ -0,0 +1,132 @@
+"""
+Rolling conversation memory shared by the CLI (main.py) and the web apps.
+Recent turns are kept verbatim; once they no longer fit the token budget the
+oldest ones are folded into a running summary, so the context prepended to
+each query stays within a predictable size however long the session runs.
+"""
+import re
+
+from root_agent.config.config_loader import get_float_setting, get_int_setting
+from root_agent.tools.compaction import TRUNCATION_MARKER, estimate_tokens
+
+# Session state key holding the serialized memory
+STATE_KEY = "conversation_memory"
+
+DEFAULT_TOKEN_BUDGET = 1500
+# Share of the budget reserved for the summary of older turns
+DEFAULT_SUMMARY_SHARE = 0.3
+
+
+def _clip(text, max_chars):
+    text = " ".join(text.split())
+    return text if len(text) <= max_chars else text[:max_chars] + TRUNCATION_MARKER
+
+
+def _first_sentence(text, max_chars=200):
+    text = " ".join(text.split())
+    match = re.match(r"(.+?[.!?])(\s|$)", text)
+    return _clip(match.group(1) if match else text, max_chars)
+
+
+def extractive_summarizer(summary_lines, folded_turns, max_tokens):
+    """
+    Default summarizer: one line per folded turn (the question and the first
+    sentence of the answer), dropping the oldest lines to stay within `max_tokens`.
+    Any callable with this signature can replace it (e.g. an LLM summarizer).
+    """
+    lines = list(summary_lines)
+    for turn in folded_turns:
+        lines.append(f"- User asked: {_clip(turn['user'], 160)} → Navo: {_first_sentence(turn['assistant'])}")
+    while lines and estimate_tokens("\n".join(lines)) > max_tokens:
+        lines.pop(0)
+    return lines
+
+
+class ConversationMemory:
+    """Recent turns verbatim plus an incrementally updated summary, under a token budget."""
+
+    def __init__(self, token_budget=None, summary_share=None, summarizer=None, data=None):
+        self.token_budget = token_budget or get_int_setting("memory_token_budget", DEFAULT_TOKEN_BUDGET)
+        self.summary_share = summary_share or get_float_setting("memory_summary_share", DEFAULT_SUMMARY_SHARE)
+        self.summarizer = summarizer or extractive_summarizer
+        data = data or {}
+        self.summary = list(data.get("summary", []))
+        self.turns = list(data.get("turns", []))
+        self.total_turns = data.get("total_turns", len(self.turns))
+        self.omitted_turns = data.get("omitted_turns", 0)
+
+    @classmethod
+    def from_state(cls, state, **kwargs):
+        return cls(data=state.get(STATE_KEY), **kwargs)
+
+    def to_dict(self):
+        return {
+            "summary": self.summary,
+            "turns": self.turns,
+            "total_turns": self.total_turns,
+            "omitted_turns": self.omitted_turns,
+        }
+
+    @property
+    def summary_budget(self):
+        return int(self.token_budget * self.summary_share)
+
+    @property
+    def recent_budget(self):
+        return self.token_budget - self.summary_budget
+
+    @staticmethod
+    def _render_turn(turn):
+        return f"User: {turn['user']}\nAssistant: {turn['assistant']}"
+
+    def _recent_tokens(self):
+        return sum(estimate_tokens(self._render_turn(turn)) for turn in self.turns)
+
+    def add_turn(self, user_text, assistant_text):
+        """Record a completed turn and fold older turns into the summary if over budget."""
+        self.turns.append({"user": user_text or "", "assistant": assistant_text or ""})
+        self.total_turns += 1
+
+        folded = []
+        while len(self.turns) > 1 and self._recent_tokens() > self.recent_budget:
+            folded.append(self.turns.pop(0))
+        if folded:
+            summarized_before = len(self.summary)
+            self.summary = self.summarizer(self.summary, folded, self.summary_budget)
+            # Turns that no longer fit even in the summary are only counted
+            self.omitted_turns += max(summarized_before + len(folded) - len(self.summary), 0)
+
+        # A single oversized turn is clipped rather than dropped
+        if self._recent_tokens() > self.recent_budget:
+            turn = self.turns[-1]
+            max_chars = max(self.recent_budget * 4 - len(turn["user"]) - 32, 200)
+            turn["assistant"] = _clip(turn["assistant"], max_chars)
+
+    def clear(self):
+        self.summary, self.turns, self.total_turns, self.omitted_turns = [], [], 0, 0
+
+    def render(self, query):
+        """The message to send for `query`, prefixed with the remembered context."""
+        sections = []
+        if self.summary or self.omitted_turns:
+            omitted = [f"- ({self.omitted_turns} earlier turns omitted)"] if self.omitted_turns else []
+            sections.append("=== CONVERSATION SUMMARY ===\n" + "\n".join(omitted + self.summary))
+        if self.turns:
+            sections.append(
+                "=== RECENT CONVERSATION ===\n"
+                + "\n".join(self._render_turn(turn) for turn in self.turns)
+                + "\n=== END HISTORY ==="
+            )
+        if not sections:
+            return query
+        return "\n".join(sections) + f"\n\nCurrent Query: {query}"
+
+    def stats(self):
+        return {
+            "total_turns": self.total_turns,
+            "recent_turns": len(self.turns),
+            "summary_lines": len(self.summary),
+            "omitted_turns": self.omitted_turns,
+            "tokens": estimate_tokens("\n".join(self.summary)) + self._recent_tokens(),
+            "token_budget": self.token_budget,
+        }
@@ -1,14 +1,24 @@
+import argparse
 import asyncio
+import copy
+import json
 import os
 import logging
 import re
+import sys
+import time
 from datetime import datetime
 from dotenv import load_dotenv
 import yaml
 from google.adk.sessions import InMemorySessionService
-from google.adk.runners import Runner
 from google.genai import types
-from root_agent.agent import root_agent
+from root_agent.agent import get_runner
+from root_agent.config.config_loader import get_bool_setting
+from root_agent.metrics import collect_timings, stage_totals
+from root_agent.tools.speculation import activate, deactivate, iterate_with_turn, start_speculation
+from conversation_memory import STATE_KEY as MEMORY_STATE_KEY, ConversationMemory
+from session_store import prune_session_events
+from session_state import InteractionHistory, interaction_count, state_sync_for
 from utils import (
     Colors,
     display_welcome_message,
@@ -105,50 +115,10 @@ async def call_agent_async(runner, user_id, session_id, query, session_with_auth
     # Use the session that has the authentication state instead of getting a fresh one
     session = session_with_auth_state
 
-    # *** ADD THIS: Ensure the runner's session has the latest state ***
-    try:
-        # Update the runner's session with our current state
-        runner_session = await runner.session_service.get_session(
-            app_name=runner.app_name, user_id=user_id, session_id=session_id
-        )
-        # Sync critical state to the runner's session
-        runner_session.state.update({
-            "mcp_session_id": session.state.get("mcp_session_id"),
-            "is_authenticated": session.state.get("is_authenticated"),
-            "use_existing_mcp_session": session.state.get("use_existing_mcp_session"),
-            "authenticated_mcp_session": session.state.get("mcp_session_id")  # Additional key for tool
-        })
-    except Exception as e:
-        print(f"{Colors.YELLOW}Warning: Could not sync session state: {e}{Colors.RESET}")
-    
-    # Build conversation context for the agent 
-    interaction_history = session.state.get("interaction_history", [])
-    context_messages = []
-    
-    # Check authentication status
-    is_authenticated = session.state.get("is_authenticated", False)
-    mcp_session_id = session.state.get("mcp_session_id")
-    
-    if interaction_history:
-        context_messages.append("=== CONVERSATION HISTORY ===")
-        for interaction in interaction_history[-5:]:  # Last 5 interactions
-            if interaction.get("type") == "user_query":
-                user_query_text = interaction.get('query', '')
-                context_messages.append(f"User: {user_query_text}")
-                # Explicitly highlight authentication messages
-                if any(phrase in user_query_text.lower() for phrase in ['logged in', 'login done', 'login complete']):
-                    context_messages.append("^^ USER CONFIRMED LOGIN COMPLETION ^^")
-            elif interaction.get("type") == "agent_response":
-                response = interaction.get('response', '')[:150]  # Truncate long responses
-                context_messages.append(f"Assistant: {response}...")
-        context_messages.append("=== END HISTORY ===")
-        context_messages.append("")  # Empty line
-    
-    # Combine context and current query
-    if context_messages:
-        full_message = "\n".join(context_messages) + f"Current Query: {query}"
-    else:
-        full_message = query
+    # Build conversation context for the agent: rolling summary + recent turns under a token budget
+    use_memory = get_bool_setting("conversation_memory", True)
+    memory = ConversationMemory.from_state(session.state)
+    full_message = memory.render(query) if use_memory else query
     
     # DEBUG: Print what we're sending to the agent
     print(f"{Colors.YELLOW}DEBUG - Sending to agent:{Colors.RESET}")
@@ -160,6 +130,10 @@ async def call_agent_async(runner, user_id, session_id, query, session_with_auth
     final_response_text = None
     active_agent_name = None
 
+    # Opt-in: search likely sources while the first model call is in flight
+    turn = start_speculation(session.state, query)
+    token = activate(turn)
+
     try:
         async for event in runner.run_async(
             user_id=user_id, session_id=session_id, new_message=content
@@ -173,29 +147,33 @@ async def call_agent_async(runner, user_id, session_id, query, session_with_auth
                 final_response_text = response
     except Exception as e:
         print(f"{Colors.RED}❌ Error: {e}{Colors.RESET}")
+    finally:
+        deactivate(token, turn)
 
-    # Simplified session update
+    # Fold this turn into the conversation memory (older turns get summarized)
+    if final_response_text and use_memory:
+        memory.add_turn(query, final_response_text)
+        session.state[MEMORY_STATE_KEY] = memory.to_dict()
+        # The memory now carries this turn; keep the runner's event history from growing the prompt
+        prune_session_events(runner.session_service, runner.app_name, user_id, session_id)
+
+    # Simplified session update (the local session owns the state; only changed keys are synced)
     if final_response_text and active_agent_name:
         try:
-            session = await runner.session_service.get_session(
-                app_name=runner.app_name, user_id=user_id, session_id=session_id
-            )
-            
             # Store response without excessive logging
             agent_output_key = f"{active_agent_name}_output"
             session.state[agent_output_key] = final_response_text
             session.state["last_active_subagent"] = active_agent_name
             session.state["last_agent_response"] = final_response_text
             
-            # Add to history
-            interaction_history = session.state.get("interaction_history", [])
-            interaction_history.append({
+            # Add to history (bounded; older entries spill to the archive if configured)
+            InteractionHistory.for_session(session).append({
                 "timestamp": datetime.now().isoformat(),
                 "type": "agent_response",
                 "agent": active_agent_name,
                 "response": final_response_text
             })
-            session.state["interaction_history"] = interaction_history
+            state_sync_for(runner.session_service).sync(session)
             
         except Exception as e:
             print(f"{Colors.YELLOW}Warning: Could not update session: {e}{Colors.RESET}")
@@ -208,14 +186,12 @@ async def execute_user_query(session, session_service, app_name, user_id, sessio
         # ADD: Debug current session state before proceeding
         print(f"{Colors.YELLOW}DEBUG - Session state before query: is_authenticated = {session.state.get('is_authenticated')}{Colors.RESET}")
         
-        # Add query to interaction history
-        interaction_history = session.state.get("interaction_history", [])
-        interaction_history.append({
+        # Add query to interaction history (bounded ring buffer)
+        InteractionHistory.for_session(session).append({
             "timestamp": datetime.now().isoformat(),
             "type": "user_query",
             "query": user_query
         })
-        session.state["interaction_history"] = interaction_history
 
         # *** ADD THIS: Create coordinator with current session state ***
    
@@ -223,18 +199,12 @@ async def execute_user_query(session, session_service, app_name, user_id, sessio
         # Get fresh session data for coordinator
         # fresh_session = await session_service.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
 
-        # Create runner with up-to-date coordinator
-        root_agent_instance = root_agent(session=session)
-        runner = Runner(
-           agent=root_agent_instance,
-           app_name=app_name,
-           session_service=session_service,
-        )
+        # Reuse the coordinator and runner built for this tool selection
+        runner = get_runner(session, app_name, session_service, query=user_query)
     
-        # *** ADD THIS: Ensure runner's session is synced before execution ***
+        # Ensure runner's session is synced before execution (changed keys only)
         try:
-            runner_session = await session_service.get_session(app_name=app_name, user_id=user_id, session_id=session_id)
-            runner_session.state.update(session.state)  # Sync all state
+            state_sync_for(session_service).sync(session)
         except Exception as e:
             print(f"{Colors.YELLOW}Warning: Could not sync runner session: {e}{Colors.RESET}")
         
@@ -338,11 +308,148 @@ Let's get started!{Colors.RESET}
             break
     # Cleanup and final status
     print(f"\n{Colors.HEADER}📊 FINAL SESSION SUMMARY{Colors.ENDC}")
-    print(f"{Colors.CYAN}Total Interactions: {len(session.state.get('interaction_history', []))}{Colors.ENDC}")
+    print(f"{Colors.CYAN}Total Interactions: {interaction_count(session.state)}{Colors.ENDC}")
     print(f"{Colors.CYAN}Errors Encountered: {session.state.get('error_count', 0)}{Colors.ENDC}")
     print(f"{Colors.GREEN}Thank you for using Navo! 🚀✨{Colors.ENDC}")
 
+REPLAY_USER_ID = "replay"
+PREFERENCE_KEYS = ("tool", "role", "team", "project")
+
+
+async def replay_one(session_service, app_name, line_number, record):
+    """Run one replay record in a fresh session; returns the output record."""
+    query = record.get("query", "")
+    preferences = record.get("preferences") or {}
+    result = {"line": line_number, "id": record.get("id"), "query": query, "preferences": preferences}
+    state = copy.deepcopy(initial_state)
+    state.update({key: preferences[key] for key in PREFERENCE_KEYS if key in preferences})
+    session = session_service.create_session(
+        app_name=app_name, user_id=REPLAY_USER_ID, session_id=f"replay-{line_number}", state=state
+    )
+
+    started = time.perf_counter()
+    timings = {}
+    tool_calls, agents, pending = [], [], {}
+    final_text = None
+    turn = None
+    try:
+        runner = get_runner(session, app_name, session_service, query=query)
+        timings["runner_seconds"] = round(time.perf_counter() - started, 4)
+
+        message = query + (f"\nPreferences: {json.dumps(preferences)}" if preferences else "")
+        content = types.Content(role="user", parts=[types.Part(text=message)])
+        turn = start_speculation(session.state, query)
+        events = runner.run_async(user_id=REPLAY_USER_ID, session_id=session.id, new_message=content)
+        async for event in iterate_with_turn(turn, events):
+            now = time.perf_counter()
+            timings.setdefault("first_event_seconds", round(now - started, 4))
+            if event.author and event.author not in agents:
+                agents.append(event.author)
+            for call in event.get_function_calls():
+                pending[call.id or call.name] = len(tool_calls)
+                tool_calls.append({"agent": event.author, "name": call.name, "args": call.args or {}, "started": now})
+            for response in event.get_function_responses():
+                index = pending.pop(response.id or response.name, None)
+                if index is not None:
+                    call = tool_calls[index]
+                    call["seconds"] = round(now - call.pop("started"), 4)
+            if event.is_final_response() and event.content and event.content.parts:
+                final_text = (event.content.parts[0].text or "").strip()
+                break
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if turn is not None:
+            turn.finish()
+        session_service.delete_session(app_name=app_name, user_id=REPLAY_USER_ID, session_id=session.id)
+
+    for call in tool_calls:
+        # Calls that never got a response (e.g. the run failed) keep no duration
+        call.pop("started", None)
+    timings["total_seconds"] = round(time.perf_counter() - started, 4)
+    result.update({"response": final_text, "agents": agents, "tool_calls": tool_calls, "timings": timings})
+    return result
+
+
+def read_replay_records(input_path):
+    """
+    ([(line number, record)], [error result]) for a replay JSONL file. A line
+    that is not a JSON object is reported with its number instead of aborting
+    the replay.
+    """
+    records, invalid = [], []
+    with open(input_path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                invalid.append({"line": n, "error": f"Invalid JSON on line {n}: {e}"})
+                continue
+            if not isinstance(record, dict):
+                invalid.append({"line": n, "error": f"Line {n} is not a JSON object"})
+                continue
+            records.append((n, record))
+    for result in invalid:
+        print(f"{Colors.RED}❌ {input_path}: {result['error']}{Colors.ENDC}")
+    return records, invalid
+
+
+async def replay(input_path, output_path, concurrency=4):
+    """
+    Non-interactive mode: run every JSONL record ({"query", "preferences", "id"})
+    in its own session, `concurrency` at a time, and write one result per line
+    (response, agents, tool calls, timings incl. per-stage span totals) as each finishes.
+    """
+    app_name = "Navo"
+    session_service = InMemorySessionService()
+    records, invalid = read_replay_records(input_path)
+    semaphore = asyncio.Semaphore(concurrency)
+    started = time.perf_counter()
+    failed = len(invalid)
+
+    async def run(line_number, record):
+        async with semaphore:
+            # Model/tool/embedding/search spans of this record, summed per stage
+            with collect_timings() as spans:
+                result = await replay_one(session_service, app_name, line_number, record)
+            result["timings"]["stages"] = stage_totals(spans)
+            return result
+
+    with open(output_path, "w", encoding="utf-8") as out:
+        for result in invalid:
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        for finished in asyncio.as_completed([run(n, record) for n, record in records]):
+            result = await finished
+            failed += "error" in result or not result["response"]
+            out.write(json.dumps(result, ensure_ascii=False, default=str) + "\n")
+            out.flush()
+            print(f"{Colors.CYAN}[{result['line']}] {result['timings']['total_seconds']}s "
+                  f"{result.get('error') or (result['response'] or '')[:80]!r}{Colors.ENDC}")
+
+    elapsed = time.perf_counter() - started
+    if invalid:
+        print(f"{Colors.YELLOW}⚠️ Skipped {len(invalid)} invalid line(s): {[r['line'] for r in invalid]}{Colors.ENDC}")
+    print(f"{Colors.GREEN}✅ Replayed {len(records)} queries in {elapsed:.1f}s "
+          f"({failed} without a response) → {output_path}{Colors.ENDC}")
+    return failed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Navo engineering assistant (interactive by default).")
+    parser.add_argument("--replay", metavar="JSONL", help="Run the queries in this JSONL file instead of prompting")
+    parser.add_argument("--output", metavar="JSONL", help="Replay results (default: <input>.results.jsonl)")
+    parser.add_argument("--concurrency", type=int, default=4, help="Replay queries run at once")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    if args.replay:
+        output = args.output or f"{os.path.splitext(args.replay)[0]}.results.jsonl"
+        failed = asyncio.run(replay(args.replay, output, args.concurrency))
+        sys.exit(1 if failed else 0)
     try:
         asyncio.run(main())
     except Exception as e:
@@ -1,6 +1,8 @@
 """Root agent for enterprise memory & search"""
 import os
+import threading
 from google.adk.agents import Agent
+from google.adk.runners import Runner
 from google.adk.tools.agent_tool import AgentTool
 from google.adk.sessions import InMemorySessionService, Session
 import vertexai
@@ -10,20 +12,76 @@ from .sub_agents.github.agent import get_github_agent
 from .sub_agents.jira.agent import get_jira_agent
 from .sub_agents.confluence.agent import get_confluence_agent
 from .sub_agents.servicenow.agent import get_servicenow_agent
-from .sub_agents.multitool_agent.agent import get_multiple_tool_agent
+from .sub_agents.multitool_agent.agent import get_concurrent_tool_agent, get_multiple_tool_agent, make_fan_out_tool
+from .config.config_loader import get_setting
+from .llm_backend import resolve_model
+from .metrics import span
+from .tools.github_tool import fetch_github_prs, fetch_github_discussions, fetch_github_files
+from .tools.jira_tool import fetch_jira_issues
+from .tools.confluence_tool import fetch_confluence_pages
+from .tools.servicenow_tool import fetch_servicenow_incidents
+from .tools.router import route_query
+from .tools.tool_executor import offload
 from . import prompt
 
 MODEL = "gemini-2.0-flash"
 
-def get_root_agent(session: Session):
-    """
-    Root agent orchestrating all sub-agents for enterprise knowledge memory.
-    Routes queries to the appropriate sub-agent based on query context.
-    """
-    # Validate and reset session.state['tool'] to only valid tool names
-    valid_tools = {"github", "jira", "confluence", "servicenow"}
-    selected_tools = [t.lower() for t in session.state.get("tool", []) if t.lower() in valid_tools]
-    session.state["tool"] = selected_tools
+VALID_TOOLS = ("github", "jira", "confluence", "servicenow")
+
+# sub_agents: root → AgentTool(sub-agent LLM) → fetch_*
+# direct: root calls fetch_* itself (one model hop less per search)
+TOOL_MODES = ("sub_agents", "direct")
+
+# Retrieval functions handed to the root agent in direct mode
+DIRECT_TOOLS = {
+    "github": (fetch_github_prs, fetch_github_discussions, fetch_github_files),
+    "jira": (fetch_jira_issues,),
+    "confluence": (fetch_confluence_pages,),
+    "servicenow": (fetch_servicenow_incidents,),
+}
+
+SUB_AGENT_FACTORIES = {
+    "github": get_github_agent,
+    "jira": get_jira_agent,
+    "confluence": get_confluence_agent,
+    "servicenow": get_servicenow_agent,
+}
+
+# Built graphs and Runners, keyed by the normalized tool selection. Runner keys
+# hold the session service object itself (hashed by identity), not its id().
+_agent_cache = {}
+_runner_cache = {}
+_cache_lock = threading.Lock()
+
+
+def normalize_tools(tools):
+    """Lower-case, de-duplicate and order a tool selection; unknown names are dropped."""
+    requested = {t.lower() for t in (tools or []) if isinstance(t, str)}
+    return tuple(t for t in VALID_TOOLS if t in requested)
+
+
+def get_tool_mode():
+    mode = get_setting("tool_mode", "sub_agents")
+    if mode not in TOOL_MODES:
+        raise ValueError(f"Unknown tool_mode {mode!r}; expected one of {TOOL_MODES}")
+    return mode
+
+
+def build_direct_tools(selected_tools):
+    """fetch_* tools for direct mode: the selected source(s), a fan-out for several, or all."""
+    if len(selected_tools) > 1:
+        return [make_fan_out_tool(list(selected_tools))]
+    sources = selected_tools or VALID_TOOLS
+    return [offload(fetch) for source in sources for fetch in DIRECT_TOOLS[source]]
+
+
+def build_root_agent(selected_tools):
+    """Build the root agent graph for a normalized tool selection."""
+    if get_tool_mode() == "direct":
+        return _make_root_agent(
+            build_direct_tools(selected_tools),
+            prompt.ROOT_AGENT_PROMPT + prompt.DIRECT_TOOLS_PROMPT,
+        )
 
     tools = []
 
@@ -31,30 +89,34 @@ def get_root_agent(session: Session):
     if len(selected_tools) == 1:
         tool = selected_tools[0]
         if tool == "github":
-            tools.append(AgentTool(agent=get_github_agent(session)))
+            tools.append(AgentTool(agent=get_github_agent()))
         elif tool == "jira":
-            tools.append(AgentTool(agent=get_jira_agent(session)))
+            tools.append(AgentTool(agent=get_jira_agent()))
         elif tool == "confluence":
-            tools.append(AgentTool(agent=get_confluence_agent(session)))
+            tools.append(AgentTool(agent=get_confluence_agent()))
         elif tool == "servicenow":
-            tools.append(AgentTool(agent=get_servicenow_agent(session)))
+            tools.append(AgentTool(agent=get_servicenow_agent()))
 
     # Multiple tools → use Multi-Tool agent
     elif len(selected_tools) > 1:
-        tools.append(AgentTool(agent=get_multiple_tool_agent(session)))
+        tools.append(AgentTool(agent=get_multiple_tool_agent(selected_tools)))
 
     # If empty → optionally include all agents for query-based routing
     else:
         tools = [
-            AgentTool(agent=get_github_agent(session)),
-            AgentTool(agent=get_jira_agent(session)),
-            AgentTool(agent=get_confluence_agent(session)),
-            AgentTool(agent=get_servicenow_agent(session)),
+            AgentTool(agent=get_github_agent()),
+            AgentTool(agent=get_jira_agent()),
+            AgentTool(agent=get_confluence_agent()),
+            AgentTool(agent=get_servicenow_agent()),
         ]
 
+    return _make_root_agent(tools, prompt.ROOT_AGENT_PROMPT)
+
+
+def _make_root_agent(tools, instruction):
     return Agent(
         name="Navo",
-        model=MODEL,
+        model=resolve_model(MODEL),
         description=(
             "Orchestrates sub-agents (GitHub, Jira, Confluence, ServiceNow) with smart routing. "
             "- Single tool in preferences → route to that agent. "
@@ -62,8 +124,75 @@ def get_root_agent(session: Session):
             "- Empty or no tool → route based on query keywords. "
             "- General queries → provide explanations or fallback guidance."
         ),
-        instruction=prompt.ROOT_AGENT_PROMPT,
+        # Per-session preferences are filled in from session.state at run time
+        instruction=instruction,
         output_key="root_agent_output",
         tools=tools,
     )
-root_agent = get_root_agent
\ No newline at end of file
+
+
+def get_root_agent_for_tools(tools):
+    """Return the shared root agent for `tools`, building it on first use."""
+    selected_tools = normalize_tools(tools)
+    return _cached(_agent_cache, selected_tools, lambda: build_root_agent(selected_tools))
+
+
+def get_root_agent(session: Session):
+    """
+    Root agent orchestrating all sub-agents for enterprise knowledge memory.
+    Routes queries to the appropriate sub-agent based on query context.
+    The agent graph is shared by every session with the same tool selection.
+    """
+    # Validate and reset session.state['tool'] to only valid tool names
+    selected_tools = normalize_tools(session.state.get("tool", []))
+    session.state["tool"] = list(selected_tools)
+    return get_root_agent_for_tools(selected_tools)
+
+
+def build_routed_agent(sources):
+    """
+    Agent that answers directly for sources picked by the local router, skipping
+    the root routing call: the source's own agent, or a concurrent fan-out agent.
+    """
+    if len(sources) == 1:
+        return SUB_AGENT_FACTORIES[sources[0]]()
+    return get_concurrent_tool_agent(list(sources))
+
+
+def _cached(cache, key, build):
+    value = cache.get(key)
+    if value is None:
+        with _cache_lock:
+            value = cache.get(key)
+            if value is None:
+                with span("agent_build"):
+                    value = build()
+                cache[key] = value
+    return value
+
+
+def get_runner(session: Session, app_name, session_service, query=None):
+    """
+    Return a Runner for the session's tool selection, shared across requests.
+    With `query` and no tool selected, the local intent router may pick the
+    source(s) itself; otherwise the root agent routes with the LLM.
+    """
+    agent = get_root_agent(session)
+    selected_tools = normalize_tools(session.state.get("tool", []))
+    key = (app_name, session_service, selected_tools)
+
+    if query and not selected_tools:
+        with span("route"):
+            decision = route_query(query)
+        if decision and not decision["fallback"]:
+            sources = normalize_tools(decision["sources"])
+            agent = _cached(_agent_cache, ("routed", sources), lambda: build_routed_agent(sources))
+            key = (app_name, session_service, "routed", sources)
+
+    return _cached(
+        _runner_cache, key,
+        lambda: Runner(agent=agent, app_name=app_name, session_service=session_service),
+    )
+
+
+root_agent = get_root_agent
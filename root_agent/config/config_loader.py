@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 import yaml
 
@@ -16,3 +17,48 @@ def load_config():
 
 config = load_config()
 BASE_URL = config["server"]["base_url"]
+
+
+def get_setting(name, default=None):
+    """
+    Read a Navo setting. An environment variable NAVO_<NAME> wins over
+    the `navo:` section of config.yaml, which wins over `default`.
+    """
+    env_value = os.getenv(f"NAVO_{name.upper()}")
+    if env_value is not None:
+        return env_value
+    value = (config.get("navo") or {}).get(name)
+    return default if value is None else value
+
+
+def get_bool_setting(name, default=False):
+    value = get_setting(name, default)
+    if isinstance(value, str):
+        return value.strip().lower() in {"1", "true", "yes", "on"}
+    return bool(value)
+
+
+def get_int_setting(name, default=0):
+    value = get_setting(name, default)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def get_float_setting(name, default=0.0):
+    value = get_setting(name, default)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def get_list_setting(name, default=None):
+    """A list from YAML, or a comma-separated string (e.g. NAVO_<NAME>=jira,github)."""
+    value = get_setting(name, default)
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return list(value)
@@ -0,0 +1,178 @@
+# root_agent/llm_backend.py
+"""
+Model backend for every agent. With llm_backend "gemini" (default) agents get
+the model ADK resolves for their model name; with "stub" they get a StubLlm,
+a deterministic offline stand-in used for load tests, which answers each turn
+with one tool call and then a short text, after a configurable delay. Either
+way the model is wrapped in a TimedLlm that records a "model" span per call.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import types
+
+from root_agent.config.config_loader import get_float_setting, get_setting
+from root_agent.metrics import observe
+
+LLM_BACKENDS = ("gemini", "stub")
+
+# Words that steer the stub towards a source's tool (agent or fetch_*)
+SOURCE_HINTS = {
+    "github": ("github", "pr", "prs", "pull", "commit", "repo", "merged", "code"),
+    "jira": ("jira", "ticket", "tickets", "bug", "bugs", "issue", "issues", "story", "sprint"),
+    "confluence": ("confluence", "doc", "docs", "wiki", "runbook", "architecture", "design"),
+    "servicenow": ("servicenow", "incident", "incidents", "outage", "root", "cause", "down"),
+}
+MAX_ANSWER_CHARS = 400
+
+
+def _last_user_text(contents):
+    for content in reversed(contents):
+        if content.role != "user":
+            continue
+        texts = [part.text for part in content.parts or [] if part.text]
+        if texts:
+            text = texts[-1]
+            # Drop the conversation memory and preferences wrapped around the query
+            text = text.rsplit("Current Query:", 1)[-1]
+            return text.split("\nPreferences:", 1)[0].strip()
+    return ""
+
+
+def _function_responses_since_user_text(contents):
+    """Function responses received after the latest user text, i.e. in this turn."""
+    responses = []
+    for content in reversed(contents):
+        parts = content.parts or []
+        if content.role == "user" and any(part.text for part in parts):
+            break
+        responses.extend(part.function_response for part in parts if part.function_response)
+    return list(reversed(responses))
+
+
+class StubLlm(BaseLlm):
+    """
+    Offline model: calls the tool best matching the query (by SOURCE_HINTS,
+    ties broken by a hash of the query), then answers with a summary of the
+    tool's response. Each call waits `latency_ms` ± `jitter_ms`; the jitter is
+    seeded by the request, so identical runs see identical delays.
+    """
+
+    latency_ms: float = 300.0
+    jitter_ms: float = 0.0
+
+    def _delay(self, seed_text):
+        rng = random.Random(hashlib.sha256(seed_text.encode("utf-8")).hexdigest())
+        return max(self.latency_ms + rng.uniform(-self.jitter_ms, self.jitter_ms), 0.0) / 1000
+
+    @staticmethod
+    def _pick_tool(tool_names, query):
+        words = set(re.findall(r"[a-z]+", query.lower()))
+
+        def score(name):
+            return sum(
+                len(words & set(hints)) for source, hints in SOURCE_HINTS.items() if source in name
+            )
+
+        best = max(score(name) for name in tool_names)
+        candidates = sorted(name for name in tool_names if score(name) == best)
+        digest = int(hashlib.sha256(query.encode("utf-8")).hexdigest(), 16)
+        return candidates[digest % len(candidates)]
+
+    @staticmethod
+    def _tool_args(tool, query):
+        """Fill string parameters with the query and `k` with a small count; the rest keep their defaults."""
+        try:
+            declaration = tool._get_declaration()
+            properties = declaration.parameters.properties if declaration and declaration.parameters else {}
+        except Exception:
+            properties = {}
+        args = {}
+        for name, schema in (properties or {}).items():
+            if schema.type == types.Type.STRING:
+                args[name] = query
+            elif name == "k":
+                args[name] = 3
+        return args or {"query": query}
+
+    @staticmethod
+    def _answer(query, responses):
+        if not responses:
+            return f"(stub) No tool was needed for: {query}"
+        summaries = [
+            f"{response.name}: {json.dumps(response.response, default=str)[:MAX_ANSWER_CHARS]}"
+            for response in responses
+        ]
+        return f"(stub) Results for: {query}\n" + "\n".join(summaries)
+
+    async def generate_content_async(self, llm_request, stream=False):
+        query = _last_user_text(llm_request.contents)
+        responses = _function_responses_since_user_text(llm_request.contents)
+        await asyncio.sleep(self._delay(f"{self.model}|{query}|{len(responses)}"))
+
+        tools = llm_request.tools_dict
+        if tools and not responses:
+            name = self._pick_tool(list(tools), query)
+            call = types.FunctionCall(name=name, args=self._tool_args(tools[name], query))
+            yield LlmResponse(content=types.Content(role="model", parts=[types.Part(function_call=call)]))
+            return
+
+        text = self._answer(query, responses)
+        if stream:
+            # Stream in a few chunks, then the aggregated text, like a streaming model does
+            words = text.split(" ")
+            step = max(len(words) // 3, 1)
+            for i in range(0, len(words), step):
+                chunk = " ".join(words[i:i + step]) + " "
+                yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=chunk)]), partial=True)
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=text)]), turn_complete=True)
+
+
+class TimedLlm(BaseLlm):
+    """
+    Delegates to `inner` and observes a "model" span per call: the time until
+    the complete (non-partial) response arrives. ADK runs tools while the model
+    generator is suspended, so the generator's lifetime would include them.
+    """
+
+    inner: BaseLlm
+
+    async def generate_content_async(self, llm_request, stream=False):
+        started = time.perf_counter()
+        observed = False
+        try:
+            async for response in self.inner.generate_content_async(llm_request, stream=stream):
+                if not observed and not response.partial:
+                    observe("model", time.perf_counter() - started, self.model)
+                    observed = True
+                yield response
+        finally:
+            if not observed:
+                observe("model", time.perf_counter() - started, self.model)
+
+    def connect(self, llm_request):
+        return self.inner.connect(llm_request)
+
+
+def resolve_model(model_name):
+    """The `model` to give an Agent that would otherwise use `model_name`."""
+    backend = get_setting("llm_backend", "gemini")
+    if backend not in LLM_BACKENDS:
+        raise ValueError(f"Unknown llm_backend {backend!r}; expected one of {LLM_BACKENDS}")
+    if backend == "gemini":
+        inner = LLMRegistry.new_llm(model_name)
+    else:
+        inner = StubLlm(
+            model=f"stub/{model_name}",
+            latency_ms=get_float_setting("stub_llm_latency_ms", 300.0),
+            jitter_ms=get_float_setting("stub_llm_jitter_ms", 0.0),
+        )
+    return TimedLlm(model=inner.model, inner=inner)
@@ -0,0 +1,122 @@
+# root_agent/metrics.py
+"""
+Per-stage latency spans. Every span is observed into a Prometheus-style
+histogram (served as text on /metrics) and, while a request is being
+collected, appended to that request's timings for its Server-Timing header.
+No client library is needed: the exposition format is rendered here.
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Prometheus text exposition format served on /metrics
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label combination."""
+
+    def __init__(self, name, documentation, labelnames, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total, count) for key, (counts, total, count) in self._series.items()}
+        for key, (counts, total, count) in sorted(series.items()):
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key))
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {bucket_count}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return lines
+
+
+stage_seconds = Histogram(
+    "navo_stage_seconds",
+    "Time spent in each stage of a chat request.",
+    labelnames=("stage", "detail"),
+)
+
+# Timings of the request being served; tool threads see it through copied contexts
+_request_timings = contextvars.ContextVar("navo_request_timings", default=None)
+
+
+@contextmanager
+def span(stage, detail=""):
+    """Time the enclosed block as `stage` (e.g. "tool", detail "fetch_jira_issues")."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(stage, time.perf_counter() - started, detail)
+
+
+def observe(stage, seconds, detail=""):
+    stage_seconds.observe(seconds, stage=stage, detail=detail)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+@contextmanager
+def collect_timings():
+    """Collect the spans of the enclosed request; yields the (stage, seconds) list."""
+    timings = []
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def stage_totals(timings):
+    """{stage: {"seconds", "count"}} in order of first appearance."""
+    totals = {}
+    for stage, seconds in timings:
+        total = totals.setdefault(stage, {"seconds": 0.0, "count": 0})
+        total["seconds"] += seconds
+        total["count"] += 1
+    for total in totals.values():
+        total["seconds"] = round(total["seconds"], 4)
+    return totals
+
+
+def server_timing(timings):
+    """Server-Timing header value, e.g. 'model;dur=812.4;desc="2 calls", tool;dur=95.1'."""
+    entries = []
+    for stage, total in stage_totals(timings).items():
+        entry = f"{stage};dur={total['seconds'] * 1000:.1f}"
+        if total["count"] > 1:
+            entry += f';desc="{total["count"]} calls"'
+        entries.append(entry)
+    return ", ".join(entries)
+
+
+def render_metrics():
+    return "\n".join(stage_seconds.render()) + "\n"
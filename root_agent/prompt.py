@@ -9,7 +9,7 @@ Steps to follow:
    - If the query is ambiguous or references multiple tools, ask for clarification or suggest selecting the appropriate tool(s).
    - Always avoid returning or processing any unsecure, harmful, or irrelevant information.
 
-2. **Check session preferences** ({session.state}):
+2. **Check session preferences** (tool: {tool?}, role: {role?}, team: {team?}, project: {project?}):
    - If the tool list is empty (`"tool": []`), do **not** call any sub-agent by default. Analyze the query text to decide which single agent (or none) to call.
    - If a single tool is listed (e.g., {"tool": ["GitHub"]}), route only to that agent.
    - If multiple tools are listed (`tool.length > 1`), route to a Multi-Tool agent handling only the specified tools.
@@ -47,4 +47,19 @@ Important:
 - If the user query/intent references a tool not selected, ask the user to select the correct tool.
 - The user-facing response must be plain text; do not return JSON unless explicitly requested.
 - Never return or process harmful, unsecure, or irrelevant information.
-"""
\ No newline at end of file
+"""
+
+# Appended to ROOT_AGENT_PROMPT when tool_mode is "direct": the retrieval
+# functions are called by the root agent itself instead of through sub-agents.
+DIRECT_TOOLS_PROMPT = """
+Direct tool mode:
+- You have the retrieval tools themselves instead of sub-agents. "Route to the <X> agent" above means "call the <X> tools":
+  - GitHub → `fetch_github_prs(query, k)`, `fetch_github_discussions(query, k)`, `fetch_github_files(query, k)` (repo walkthroughs and code questions)
+  - Jira → `fetch_jira_issues(query, k)`
+  - Confluence → `fetch_confluence_pages(query, k)`
+  - ServiceNow → `fetch_servicenow_incidents(query, k)`
+  - Multi-Tool → `fetch_from_selected_sources(query, k)`, which searches every selected source at once
+- Pass the enriched query and the number of results the user asked for as `k` (default 3).
+- Answer from the returned records only: for each result give its ID/key, title, status, author or assignee, and the details relevant to the question.
+- If fewer results than requested come back, say how many were found. If a source is listed as timed out or failed, say so for that source.
+"""
@@ -1,11 +1,13 @@
 from google.adk.agents import Agent
+from root_agent.llm_backend import resolve_model
 from . import prompt
 from root_agent.tools.confluence_tool import fetch_confluence_pages
+from root_agent.tools.tool_executor import offload
 # semantic_confluence_search
 
 MODEL = "gemini-2.5-pro"
 
-def get_confluence_agent(query: str, k: int = 3):
+def get_confluence_agent(session=None):
     """
     User Intent:
     - Return up to 'k' Confluence pages based on user query.
@@ -27,13 +29,13 @@ Your role:
 - Provide summaries or answer context-aware queries using stored embeddings.
 """
     return Agent(
-        model=MODEL,
+        model=resolve_model(MODEL),
         name="confluence_agent",
         description="Agent for semantic search in Confluence docs",
         output_key="confluence_agent_output",
         instruction=instruction,
         tools=[
-            fetch_confluence_pages,
+            offload(fetch_confluence_pages),
             # semantic_confluence_search,  # 🔹 custom retrieval tool
         ]
     )
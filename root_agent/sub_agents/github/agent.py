@@ -1,10 +1,12 @@
 from google.adk.agents import Agent
+from root_agent.llm_backend import resolve_model
 from . import prompt
 from root_agent.tools.github_tool import fetch_github_prs
+from root_agent.tools.tool_executor import offload
 
 MODEL = "gemini-2.5-pro"
 
-def get_github_agent(session):
+def get_github_agent(session=None):
     """
     User Intent:
     - Return up to 'k' results from GitHub (PRs, discussions, files) based on user query.
@@ -27,13 +29,13 @@ Your role:
 - Help generate summaries, draft PR descriptions, or answer context-aware engineering queries.
 """
     return Agent(
-        model=MODEL,
+        model=resolve_model(MODEL),
         name="github_agent",
         description="Agent for semantic search in GitHub PRs/commits",
         output_key="github_agent_output",
         instruction=instruction,
         tools=[
-            fetch_github_prs,
+            offload(fetch_github_prs),
             # semantic_github_search,   # 🔹 custom retrieval tool
         ]
     )
@@ -1,11 +1,13 @@
 from google.adk.agents import Agent
+from root_agent.llm_backend import resolve_model
 from . import prompt
 from root_agent.tools.jira_tool import fetch_jira_issues
+from root_agent.tools.tool_executor import offload
 # , semantic_jira_search
 
 MODEL = "gemini-2.5-pro"
 
-def get_jira_agent(query: str, k: int = 3):
+def get_jira_agent(session=None):
     """
     User Intent:
     - Return up to 'k' Jira issues based on user query.
@@ -28,13 +30,13 @@ Your role:
 - Help identify similar issues, blockers, or backlog trends.
 """
     return Agent(
-        model=MODEL,
+        model=resolve_model(MODEL),
         name="jira_agent",
         description="Agent for semantic search in Jira tickets",
         output_key="jira_agent_output",
         instruction=instruction,
         tools=[
-            fetch_jira_issues,
+            offload(fetch_jira_issues),
             # semantic_jira_search,   # 🔹 custom retrieval tool
         ]
     )
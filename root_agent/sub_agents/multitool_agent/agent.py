@@ -1,7 +1,12 @@
-from google.adk.agents import ParallelAgent
+from google.adk.agents import Agent, ParallelAgent
+from root_agent.llm_backend import resolve_model
+from google.adk.tools.tool_context import ToolContext
 import logging
 
 from . import prompt 
+from root_agent.config.config_loader import get_setting
+from root_agent.metrics import span
+from root_agent.tools.fan_out import fan_out, merge_fan_out
 from ..github.agent import get_github_agent
 from ..jira.agent import get_jira_agent
 from ..confluence.agent import get_confluence_agent
@@ -10,45 +15,100 @@ from ..servicenow.agent import get_servicenow_agent
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.ERROR)
 
+MODEL = "gemini-2.0-flash"
+
+# concurrent: one LLM merges results of a deadline-bounded fetch_* fan-out
+# parallel_agents: one LLM sub-agent per source under a ParallelAgent
+MULTITOOL_MODES = ("concurrent", "parallel_agents")
+
 
 class MultiToolAgent(ParallelAgent):
     """
     ParallelAgent subclass that can merge responses from multiple sub-agents.
     """
-    def run_and_merge(self, query: str) -> str:
+    async def run_and_merge(self, query: str, k: int = 3, deadline_seconds: float = None) -> str:
+        """
+        Query the sources behind the sub-agents concurrently under a global
+        deadline and merge whatever finished in time, noting sources that
+        timed out or failed.
         """
-        Run the query across all sub-agents and merge their responses.
+        sources = [agent.name.removesuffix("_agent") for agent in self.sub_agents]
+        outcome = await fan_out(query, sources, k=k, deadline_seconds=deadline_seconds)
+        return merge_fan_out(outcome)
+
+
+def make_fan_out_tool(sources):
+    """Build a tool that queries `sources` concurrently for the concurrent multi-tool agent."""
+    async def fetch_from_selected_sources(query: str, k: int = 3, tool_context: ToolContext = None):
         """
-        responses = self.run(query)  # This returns dict: {agent_name: response}
-        merged = []
-        for agent_name, resp in responses.items():
-            if resp:
-                merged.append(f"### {agent_name.capitalize()} Response\n{resp}\n")
-        if not merged:
-            return "⚠️ No responses received from any agent."
-        return "\n".join(merged)
+        Search all selected sources (GitHub, Jira, Confluence, ServiceNow) at once.
+
+        Args:
+            query (str): The user query, enriched with extracted entities.
+            k (int): Number of results to return per source.
+
+        Returns:
+            dict: "results" per source, plus "timed_out" and "failed" sources
+            that did not answer before the deadline.
+        """
+        with span("tool", "fetch_from_selected_sources"):
+            return await fan_out(query, sources, k=k, tool_context=tool_context)
+
+    return fetch_from_selected_sources
 
 
-def get_multiple_tool_agent(session):
+def get_concurrent_tool_agent(sources):
+    """Single LLM agent over a deadline-bounded concurrent fan-out to `sources`."""
+    instruction = f"""
+{prompt.MULTI_TOOL_AGENT_PROMPT}
+
+Your role:
+- Call `fetch_from_selected_sources` once with the user query; it searches {", ".join(sources)} in parallel.
+- Merge the per-source "results" using the template above.
+- For every source listed under "timed_out" or "failed", write its section as
+  `No updates found for this tool (source timed out)` or `(source failed)` instead of inventing content.
+"""
+    return Agent(
+        model=resolve_model(MODEL),
+        name="enterprise_queries_agent",
+        description="Handles enterprise queries by searching the selected sources concurrently.",
+        output_key="enterprise_queries_agent_output",
+        instruction=instruction,
+        tools=[make_fan_out_tool(list(sources))],
+    )
+
+
+def get_multiple_tool_agent(tools):
+    """
+    Build a parallel agent over the requested `tools` (e.g. ["github", "jira"]).
+    The graph depends only on the tool selection, so callers may cache it.
+    """
     logger.info("Initializing enterprise agent with parallel sub-agents...")
 
-    # Get tool preferences from session (case-insensitive mapping)
-    requested_tools = [t.lower() for t in session.state.get("tool", [])]
-    logger.info(f"🔄 session preferences for multitool: {session.state}")
+    # Tool preferences (case-insensitive mapping)
+    requested_tools = [t.lower() for t in tools]
+    logger.info(f"🔄 tool preferences for multitool: {requested_tools}")
+
+    mode = get_setting("multitool_mode", "parallel_agents")
+    if mode not in MULTITOOL_MODES:
+        raise ValueError(f"Unknown multitool_mode {mode!r}; expected one of {MULTITOOL_MODES}")
+    if mode == "concurrent":
+        return get_concurrent_tool_agent(requested_tools)
 
-    # Map all possible agents
+    # Map all possible agents (built lazily: an agent can only have one parent)
     available_agents = {
-        "github": get_github_agent(session),
-        "jira": get_jira_agent(session),
-        "confluence": get_confluence_agent(session),
-        "servicenow": get_servicenow_agent(session),
+        "github": get_github_agent,
+        "jira": get_jira_agent,
+        "confluence": get_confluence_agent,
+        "servicenow": get_servicenow_agent,
     }
 
     # Filter agents based on requested tools
     sub_agents = []
-    for name, agent_instance in available_agents.items():
+    for name, build_agent in available_agents.items():
         if name in requested_tools:
             try:
+                agent_instance = build_agent()
                 sub_agents.append(agent_instance)
                 logger.info(f"✅ Initialized {name} agent: {agent_instance.name}")
             except Exception as e:
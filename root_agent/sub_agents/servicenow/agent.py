@@ -1,11 +1,13 @@
 from google.adk.agents import Agent
+from root_agent.llm_backend import resolve_model
 from . import prompt
 from root_agent.tools.servicenow_tool import fetch_servicenow_incidents
+from root_agent.tools.tool_executor import offload
 # , semantic_servicenow_search
 
 MODEL = "gemini-2.5-pro"
 
-def get_servicenow_agent(query: str, k: int = 3):
+def get_servicenow_agent(session=None):
     """
     User Intent:
     - Return up to 'k' ServiceNow incidents based on user query.
@@ -28,13 +30,13 @@ Your role:
 - Provide context-aware insights for ITSM workflows.
 """
     return Agent(
-        model=MODEL,
+        model=resolve_model(MODEL),
         name="servicenow_agent",
         description="Agent for semantic search in ServiceNow incidents",
         output_key="servicenow_agent_output",
         instruction=instruction,
         tools=[
-            fetch_servicenow_incidents,
+            offload(fetch_servicenow_incidents),
             # semantic_servicenow_search,   # 🔹 custom retrieval tool
         ]
     )
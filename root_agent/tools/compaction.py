@@ -0,0 +1,190 @@
+# tools/compaction.py
+"""
+Token-budgeted projection of fetch_* results before they reach the model.
+Each hit keeps its score/match markers, the highest-value metadata fields
+for its source, and a text body trimmed so the whole result fits the budget.
+Full results stay in the result cache; only what the LLM sees is compacted.
+"""
+
+import functools
+import inspect
+import json
+import logging
+
+from root_agent.config.config_loader import get_int_setting
+from root_agent.metrics import span
+
+logger = logging.getLogger(__name__)
+
+# Rough size of a token for English/JSON text (no tokenizer dependency)
+CHARS_PER_TOKEN = 4
+DEFAULT_TOKEN_BUDGET = 1500
+# Never trim a hit's text below this, even when the budget is exhausted
+MIN_TEXT_TOKENS = 40
+MAX_FIELD_CHARS = 200
+TRUNCATION_MARKER = " …[truncated]"
+
+# Text-bearing keys in fetch_* hits, in the order they are looked up
+TEXT_KEYS = ("text", "incident_summary")
+# Small keys that are always kept as-is
+KEEP_KEYS = ("score", "match", "info", "error")
+
+# Metadata worth showing the model, most valuable first
+SOURCE_FIELDS = {
+    "github": ("id", "pr_id", "title", "status", "author", "created_by", "created_at",
+               "merged_at", "url", "repo", "path", "linked_incident", "team", "project"),
+    "jira": ("jira_id", "key", "id", "title", "status", "priority", "criticalness", "type",
+             "assignee", "created_at", "resolved_at", "linked_incident", "linked_git_pr",
+             "team", "project"),
+    "confluence": ("title", "team", "project", "created_by", "created_at", "labels", "url"),
+    "servicenow": ("id", "title", "status", "importance", "created_at", "resolved_at",
+                   "root_cause", "resolution", "team", "project"),
+}
+
+
+def serialized_chars(value):
+    """Length of `value` as JSON with every escape spelled out (quotes, newlines, \\uXXXX)."""
+    return len(json.dumps(value, default=str))
+
+
+def estimate_tokens(value):
+    # Measured on the serialized form the model receives, not the raw text
+    return (serialized_chars(value) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _escaped_len(text):
+    return serialized_chars(text) - 2  # without the surrounding quotes
+
+
+def _clip(value, max_chars):
+    if isinstance(value, (list, dict)):
+        value = json.dumps(value, ensure_ascii=False, default=str)
+    if isinstance(value, str) and len(value) > max_chars:
+        return value[:max_chars] + TRUNCATION_MARKER
+    return value
+
+
+def trim_text(text, max_tokens):
+    """
+    Keep whole lines from the top (formatters put key fields first) so the
+    JSON-escaped text fits `max_tokens`, truncation marker included.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if _escaped_len(text) + 2 <= max_chars:
+        return text
+    max_chars -= _escaped_len(TRUNCATION_MARKER) + 2
+    kept, used = [], 0
+    for line in text.splitlines():
+        cost = _escaped_len(line) + 2  # the line plus its escaped "\n"
+        if used + cost > max_chars:
+            remaining = max_chars - used
+            if remaining > 20:
+                # Cut the line where its escaped form runs out of room
+                cut = 0
+                for char in line:
+                    remaining -= _escaped_len(char)
+                    if remaining < 0:
+                        break
+                    cut += 1
+                kept.append(line[:cut])
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept) + TRUNCATION_MARKER
+
+
+def project_metadata(metadata, source):
+    fields = SOURCE_FIELDS.get(source, ())
+    return {
+        field: _clip(metadata[field], MAX_FIELD_CHARS)
+        for field in fields
+        if metadata.get(field) not in (None, "", [], {})
+    }
+
+
+def compact_results(results, source, max_tokens=None):
+    """
+    Project `results` (a fetch_* return value) for `source` into at most
+    ~`max_tokens` tokens. Non-list results are returned unchanged.
+    """
+    if not isinstance(results, list):
+        return results
+    budget = max_tokens or get_int_setting("tool_result_token_budget", DEFAULT_TOKEN_BUDGET)
+
+    compacted, texts = [], []
+    for hit in results:
+        if not isinstance(hit, dict):
+            compacted.append(hit)
+            texts.append(None)
+            continue
+        item = {key: hit[key] for key in KEEP_KEYS if key in hit}
+        if isinstance(hit.get("metadata"), dict):
+            item["metadata"] = project_metadata(hit["metadata"], source)
+        text_key = next((key for key in TEXT_KEYS if isinstance(hit.get(key), str)), None)
+        compacted.append(item)
+        texts.append((text_key, hit[text_key]) if text_key else None)
+
+    # Budget left for the text bodies once scores/metadata are accounted for,
+    # shared evenly; short texts hand their unused share to the longer ones.
+    remaining = max(budget - estimate_tokens(compacted), 0)
+    pending = sorted(
+        (i for i, text in enumerate(texts) if text),
+        key=lambda i: len(texts[i][1]),
+    )
+    for position, i in enumerate(pending):
+        text_key, text = texts[i]
+        share = max(remaining // (len(pending) - position), MIN_TEXT_TOKENS)
+        trimmed = trim_text(text, share)
+        compacted[i][text_key] = trimmed
+        remaining = max(remaining - estimate_tokens(trimmed), 0)
+
+    # Shares are estimates; trim the longest text until the serialized whole fits
+    overflow = estimate_tokens(compacted) - budget
+    while overflow > 0 and pending:
+        i = max(pending, key=lambda i: estimate_tokens(compacted[i][texts[i][0]]))
+        text_key = texts[i][0]
+        current = estimate_tokens(compacted[i][text_key])
+        if current <= MIN_TEXT_TOKENS:
+            break
+        compacted[i][text_key] = trim_text(compacted[i][text_key], max(current - overflow, MIN_TEXT_TOKENS))
+        overflow = estimate_tokens(compacted) - budget
+
+    before, after = estimate_tokens(results), estimate_tokens(compacted)
+    if after < before:
+        logger.debug(f"✂️ Compacted {source} results from ~{before} to ~{after} tokens (budget {budget})")
+    return compacted
+
+
+def compacted_tool(source):
+    """
+    Compact a fetch_* tool's results for the model. Adds a `max_tokens`
+    argument (0 = the configured default budget) to the tool's signature so
+    the agent can ask for more detail when it needs it.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        params = [p for p in signature.parameters.values() if p.name != "tool_context"]
+        params.append(inspect.Parameter(
+            "max_tokens", inspect.Parameter.POSITIONAL_OR_KEYWORD, default=0, annotation=int
+        ))
+        if "tool_context" in signature.parameters:
+            params.append(signature.parameters["tool_context"])
+
+        compact_signature = signature.replace(parameters=params)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = compact_signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            max_tokens = bound.arguments.pop("max_tokens")
+            # compact_results builds new hits, so cached/speculative results are never trimmed in place
+            with span("tool", func.__name__):
+                return compact_results(func(**bound.arguments), source, max_tokens=max_tokens)
+
+        wrapper.__signature__ = compact_signature
+        wrapper.__doc__ = (func.__doc__ or "") + (
+            "\n    max_tokens: approximate size limit for the returned results "
+            "(0 = default); raise it only when more detail is needed.\n"
+        )
+        return wrapper
+    return decorator
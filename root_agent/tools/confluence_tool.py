@@ -1,14 +1,20 @@
 # tools/confluence_tool.py
 
 import os
+from functools import partial
 import json
+from google.adk.tools.tool_context import ToolContext
 from .vector_db_agent import VectorDBAgent
+from .index_registry import register_index
+from .result_cache import cached_tool
+from .compaction import compacted_tool
+from .speculation import speculative
+from .filters import session_filters
 from root_agent.utils.preferences import PreferencesUtil
 
 # Use absolute path to ensure correct file loading
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 CONFLUENCE_DATA_PATH = os.path.join(BASE_DIR, "data", "confluence", "project001-docs.json")
-FLATTENED_PATH = os.path.join(BASE_DIR, "data", "confluence", "project001-docs_flat.json")
 
 # Debug: Print the path being used
 print(f"Confluence tool loading data from: {CONFLUENCE_DATA_PATH}")
@@ -26,9 +32,9 @@ def flatten_pages(json_path):
         else:
             return []
 
-flattened_pages = flatten_pages(CONFLUENCE_DATA_PATH)
-with open(FLATTENED_PATH, "w", encoding="utf-8") as f:
-    json.dump({"pages": flattened_pages}, f, indent=2)
+def load_pages():
+    # Re-reads the page export, so re-indexing picks up source changes
+    return flatten_pages(CONFLUENCE_DATA_PATH)
 
 def confluence_text_formatter(page):
     details = [
@@ -40,26 +46,29 @@ def confluence_text_formatter(page):
     ]
     return "\n".join(details)
 
-confluence_agent = VectorDBAgent(
-    json_path=FLATTENED_PATH,
+confluence_agent = register_index("confluence_pages", "confluence", partial(VectorDBAgent,
     collection_name="confluence_pages",
     persist_dir="chroma_store/chroma_confluence",
-    json_list_key="pages",
-    text_formatter=confluence_text_formatter
-)
+    text_formatter=confluence_text_formatter,
+    record_loader=load_pages
+))
 
-def fetch_confluence_pages(query: str, k: int = 3):
+@compacted_tool("confluence")
+@speculative("confluence")
+@cached_tool("confluence_pages")
+def fetch_confluence_pages(query: str, k: int = 3, tool_context: ToolContext = None):
     """
     User Intent:
     - Return up to 'k' Confluence pages based on user query.
     - If fewer than 'k' results are found, inform the user how many were found.
     - Provide detailed page info: title, content, and any relevant metadata.
+    - Results are limited to the session's team/project preferences when set.
     - If no results, apologize and suggest follow-up queries.
 
     Example:
         "Show me 5 pages about system architecture"
     """
-    results = confluence_agent.query(query, top_k=k)
+    results = confluence_agent.query(query, top_k=k, filters=session_filters(tool_context))
     if len(results) < k:
         results.append({"info": f"Only {len(results)} pages found for your request."})
     return results
\ No newline at end of file
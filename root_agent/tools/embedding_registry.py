@@ -0,0 +1,145 @@
+# tools/embedding_registry.py
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import psutil
+from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+from root_agent.config.config_loader import get_int_setting, get_setting
+from root_agent.metrics import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBED_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# One embedding model per (model_name, device), shared by every VectorDBAgent
+_models = {}
+_memory = {}
+_lock = threading.Lock()
+
+
+def _rss_bytes():
+    return psutil.Process().memory_info().rss
+
+
+def _parameter_bytes(embed_model):
+    # HuggingFaceEmbedding keeps the SentenceTransformer on a private attribute
+    model = getattr(embed_model, "_model", None)
+    if model is None or not hasattr(model, "parameters"):
+        return None
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+def get_embed_model(model_name=DEFAULT_EMBED_MODEL, device=None):
+    """
+    Return the process-wide embedding model for (model_name, device),
+    loading it on first use. device=None lets the library pick (cuda/mps/cpu).
+    """
+    device = device or get_setting("embed_device")
+    key = (model_name, device or "auto")
+    embed_model = _models.get(key)
+    if embed_model is not None:
+        return embed_model
+
+    with _lock:
+        if key not in _models:
+            rss_before = _rss_bytes()
+            started = time.perf_counter()
+            _models[key] = HuggingFaceEmbedding(model_name=model_name, device=device)
+            _memory[key] = {
+                "load_seconds": round(time.perf_counter() - started, 3),
+                "rss_delta_bytes": _rss_bytes() - rss_before,
+                "parameter_bytes": _parameter_bytes(_models[key]),
+            }
+            logger.info(f"🧠 Loaded embedding model {model_name} on {key[1]}: {_memory[key]}")
+        return _models[key]
+
+
+def register_embed_model(model_name, embed_model, device=None):
+    """
+    Install an already constructed embedding model under (model_name, device),
+    e.g. a deterministic stub so indexes can be built offline (benchmarks/).
+    """
+    key = (model_name, device or get_setting("embed_device") or "auto")
+    with _lock:
+        _models[key] = embed_model
+        _memory[key] = {"load_seconds": 0.0, "rss_delta_bytes": 0, "parameter_bytes": None}
+    return embed_model
+
+
+def embedding_memory_report():
+    """Resident memory attributed to each loaded embedding model."""
+    return [
+        {"model": model_name, "device": device, **_memory[(model_name, device)]}
+        for model_name, device in _models
+    ]
+
+
+class QueryEmbeddingCache:
+    """
+    Bounded LRU of query vectors keyed by (model_name, normalized query),
+    shared by every collection that uses the same embedding model.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def normalize(query):
+        return re.sub(r"\s+", " ", query).strip().casefold()
+
+    def get_or_embed(self, model_name, embed_model, query):
+        # Only the key is normalized; the model embeds the query as written
+        key = (model_name, self.normalize(query))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Embed outside the lock so concurrent misses don't serialize
+        with span("query_embedding", model_name):
+            embedding = embed_model.get_query_embedding(query)
+
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return embedding
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+query_embedding_cache = QueryEmbeddingCache(
+    max_entries=get_int_setting("query_embedding_cache_size", 1024)
+)
+
+
+def get_query_embedding(model_name, embed_model, query):
+    return query_embedding_cache.get_or_embed(model_name, embed_model, query)
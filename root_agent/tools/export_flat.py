@@ -0,0 +1,66 @@
+# tools/export_flat.py
+"""
+Write the flattened records each tool indexes to *_flat.json files, for
+inspection or for feeding other tools. Nothing at runtime reads these files.
+
+Usage:
+    python -m root_agent.tools.export_flat                      # all sources, next to the source data
+    python -m root_agent.tools.export_flat jira --out-dir /tmp  # selected sources, custom directory
+"""
+
+import argparse
+import json
+import os
+import sys
+
+from . import github_tool, jira_tool, confluence_tool, servicenow_tool
+
+# source -> [(relative output path, list key, records)]
+EXPORTS = {
+    "github": [
+        (os.path.join("github", "prs_flat.json"), "prs", github_tool.github_loader("prs")),
+        (os.path.join("github", "discussions_flat.json"), "discussions", github_tool.github_loader("discussions")),
+        (os.path.join("github", "files_flat.json"), "files", github_tool.github_loader("files")),
+    ],
+    "jira": [
+        (os.path.join("jira", "all_issues_flat.json"), "issues", jira_tool.load_issues),
+    ],
+    "confluence": [
+        (os.path.join("confluence", "project001-docs_flat.json"), "pages", confluence_tool.load_pages),
+    ],
+    "servicenow": [
+        (os.path.join("servicenow", "incidents_flat.json"), "incidents", servicenow_tool.load_incidents),
+    ],
+}
+
+DEFAULT_OUT_DIR = os.path.join(github_tool.BASE_DIR, "data")
+
+
+def export_flat(sources=None, out_dir=DEFAULT_OUT_DIR):
+    written = []
+    for source in sources or EXPORTS:
+        for relative_path, key, records in EXPORTS[source]:
+            path = os.path.join(out_dir, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({key: records()}, f, ensure_ascii=False, indent=2)
+            written.append(path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export flattened Navo source records to JSON.")
+    parser.add_argument("sources", nargs="*", help=f"Sources to export: {', '.join(EXPORTS)} (default: all)")
+    parser.add_argument("--out-dir", default=DEFAULT_OUT_DIR, help="Directory to write into")
+    args = parser.parse_args(argv)
+    unknown = [source for source in args.sources if source not in EXPORTS]
+    if unknown:
+        parser.error(f"Unknown sources: {', '.join(unknown)}")
+
+    for path in export_flat(args.sources, args.out_dir):
+        print(f"Wrote {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# tools/fan_out.py
+"""
+Concurrent multi-source retrieval. The selected sources' fetch_* calls run in
+their own bounded pool under one global deadline; whatever finishes in time is
+returned and the rest is reported as timed out or failed.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import time
+
+from root_agent.config.config_loader import get_float_setting
+from root_agent.tools.tool_executor import fan_out_executor
+from root_agent.tools.github_tool import fetch_github_prs
+from root_agent.tools.jira_tool import fetch_jira_issues
+from root_agent.tools.confluence_tool import fetch_confluence_pages
+from root_agent.tools.servicenow_tool import fetch_servicenow_incidents
+
+logger = logging.getLogger(__name__)
+
+# Primary retrieval tool per source (the one each sub-agent exposes)
+SOURCE_FETCHERS = {
+    "github": fetch_github_prs,
+    "jira": fetch_jira_issues,
+    "confluence": fetch_confluence_pages,
+    "servicenow": fetch_servicenow_incidents,
+}
+
+DEFAULT_DEADLINE_SECONDS = 8.0
+
+
+async def fan_out(query, sources, k=3, deadline_seconds=None, tool_context=None):
+    """
+    Query every source in `sources` concurrently and wait at most
+    `deadline_seconds` (NAVO_MULTITOOL_DEADLINE_SECONDS) for all of them.
+    Returns {"results": {source: hits}, "timed_out": [...], "failed": {source: error},
+    "elapsed_seconds": float}. Calls still queued at the deadline are cancelled;
+    running ones finish in the background (their results still warm the result cache).
+    """
+    if deadline_seconds is None:
+        deadline_seconds = get_float_setting("multitool_deadline_seconds", DEFAULT_DEADLINE_SECONDS)
+    unknown = [s for s in sources if s not in SOURCE_FETCHERS]
+    if unknown:
+        raise ValueError(f"Unknown sources {unknown}; expected any of {list(SOURCE_FETCHERS)}")
+
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    tasks = {
+        loop.run_in_executor(
+            fan_out_executor,
+            functools.partial(
+                contextvars.copy_context().run,
+                SOURCE_FETCHERS[source], query, k=k, tool_context=tool_context,
+            ),
+        ): source
+        for source in sources
+    }
+    done, pending = await asyncio.wait(tasks, timeout=deadline_seconds) if tasks else (set(), set())
+    for future in pending:
+        # Drops calls that never got a worker; a running call can't be interrupted
+        future.cancel()
+
+    outcome = {"results": {}, "timed_out": [], "failed": {}}
+    for future, source in tasks.items():
+        if future in pending:
+            outcome["timed_out"].append(source)
+        elif future.exception() is not None:
+            outcome["failed"][source] = str(future.exception())
+        else:
+            outcome["results"][source] = future.result()
+    outcome["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+
+    if outcome["timed_out"] or outcome["failed"]:
+        logger.warning(
+            f"⏱️ Fan-out for {sources}: timed out {outcome['timed_out']}, "
+            f"failed {list(outcome['failed'])} after {outcome['elapsed_seconds']}s"
+        )
+    return outcome
+
+
+def merge_fan_out(outcome):
+    """Render a fan_out outcome as the sectioned text the multi-tool prompt expects."""
+    merged = []
+    for source, hits in outcome["results"].items():
+        merged.append(f"### {source.capitalize()} Response\n{hits}\n")
+    for source in outcome["timed_out"]:
+        merged.append(f"### {source.capitalize()} Response\n⏱️ Timed out before the deadline.\n")
+    for source, error in outcome["failed"].items():
+        merged.append(f"### {source.capitalize()} Response\n❌ Failed: {error}\n")
+    if not merged:
+        return "⚠️ No responses received from any agent."
+    return "\n".join(merged)
@@ -0,0 +1,142 @@
+# tools/filters.py
+
+from datetime import datetime, timezone
+
+# Structured fields that can narrow a search. They are stored on every indexed
+# document as normalized copies under "_filter_<field>".
+FILTER_FIELDS = ("team", "project", "status", "type", "priority")
+
+# Date fields stored as epoch seconds under "_<field>_ts" for range queries
+DATE_FIELDS = ("created_at", "resolved_at", "updated_at")
+
+# Range filter name -> (date field, Chroma operator)
+DATE_RANGE_FILTERS = {
+    f"{field[:-3]}_{bound}": (field, op)
+    for field in DATE_FIELDS
+    for bound, op in (("after", "$gte"), ("before", "$lte"))
+}
+
+# Session preferences that are applied to every search automatically
+SESSION_FILTER_KEYS = ("team", "project")
+
+# Stored for a session filter field a record has no value for (e.g. a GitHub
+# repo block without a team), so session-scoped searches can still match it
+UNSCOPED = "*"
+
+
+class SessionScope(str):
+    """
+    A filter value taken from the session's preferences rather than from an
+    explicit tool argument. Records without a value for its field still match
+    it; a plain value only matches records that have that value.
+    """
+
+
+def filter_key(field):
+    return f"_filter_{field}"
+
+
+def timestamp_key(field):
+    return f"_{field}_ts"
+
+
+def normalize_filter_value(value):
+    return str(value).strip().casefold()
+
+
+def to_epoch(value):
+    """Convert an epoch number, datetime or ISO-8601 string to epoch seconds."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, datetime):
+        dt = value
+    else:
+        dt = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
+
+
+def filter_metadata(item):
+    """Internal metadata that lets Chroma filter on structured fields."""
+    metadata = {}
+    for field in FILTER_FIELDS:
+        value = item.get(field)
+        if value not in (None, "") and not isinstance(value, (list, dict)):
+            metadata[filter_key(field)] = normalize_filter_value(value)
+        elif field in SESSION_FILTER_KEYS:
+            metadata[filter_key(field)] = UNSCOPED
+    for field in DATE_FIELDS:
+        try:
+            ts = to_epoch(item.get(field))
+        except (TypeError, ValueError):
+            ts = None
+        if ts is not None:
+            metadata[timestamp_key(field)] = ts
+    return metadata
+
+
+def build_where(filters):
+    """
+    Translate structured filters into a Chroma `where` clause, e.g.
+    {"team": "Team001", "status": ["open", "in progress"], "created_after": "2025-07-01"}.
+    Returns None when nothing should be filtered.
+    """
+    clauses = []
+    for name, value in (filters or {}).items():
+        if value is None or value == "" or value == []:
+            continue
+        if name in FILTER_FIELDS:
+            if isinstance(value, (list, tuple, set)):
+                clauses.append({filter_key(name): {"$in": [normalize_filter_value(v) for v in value]}})
+            elif isinstance(value, SessionScope):
+                clauses.append({filter_key(name): {"$in": [normalize_filter_value(value), UNSCOPED]}})
+            else:
+                clauses.append({filter_key(name): normalize_filter_value(value)})
+        elif name in DATE_RANGE_FILTERS:
+            field, op = DATE_RANGE_FILTERS[name]
+            clauses.append({timestamp_key(field): {op: to_epoch(value)}})
+        else:
+            raise ValueError(f"Unsupported filter {name!r}")
+    if not clauses:
+        return None
+    return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+
+def record_matches(record, filters):
+    """In-memory equivalent of build_where for records that skip Chroma."""
+    metadata = filter_metadata(record)
+    for name, value in (filters or {}).items():
+        if value is None or value == "" or value == []:
+            continue
+        if name in FILTER_FIELDS:
+            wanted = value if isinstance(value, (list, tuple, set)) else [value]
+            stored = metadata.get(filter_key(name), UNSCOPED)
+            if stored == UNSCOPED and isinstance(value, SessionScope):
+                continue
+            if stored not in {normalize_filter_value(v) for v in wanted}:
+                return False
+        elif name in DATE_RANGE_FILTERS:
+            field, op = DATE_RANGE_FILTERS[name]
+            ts = metadata.get(timestamp_key(field))
+            bound = to_epoch(value)
+            if ts is None or (ts < bound if op == "$gte" else ts > bound):
+                return False
+    return True
+
+
+def session_filters(tool_context):
+    """
+    Team/project filters from the session state an ADK tool is running in, as
+    SessionScope values: records outside any team/project are not filtered out.
+    """
+    if tool_context is None:
+        return {}
+    state = tool_context.state
+    return {
+        key: SessionScope(state.get(key)) if isinstance(state.get(key), str) else state.get(key)
+        for key in SESSION_FILTER_KEYS
+        if state.get(key)
+    }
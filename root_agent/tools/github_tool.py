@@ -1,8 +1,17 @@
 # tools/github_tool.py
 
 import os
+from functools import partial
 import json
+from google.adk.tools.tool_context import ToolContext
 from .vector_db_agent import VectorDBAgent
+from .index_registry import register_index
+from .result_cache import cached_tool
+from .compaction import compacted_tool
+from .speculation import speculative
+from .id_index import RecordIdIndex, is_id_query
+from .source_records import SourceRecords
+from .filters import record_matches, session_filters
 import logging
 from root_agent.utils.preferences import PreferencesUtil
 
@@ -15,37 +24,57 @@ print(f"GitHub tool loading data from: {GITHUB_DATA_PATH}")
 print(f"File exists: {os.path.exists(GITHUB_DATA_PATH)}")
 
 
-def flatten_and_write(key, flat_path):
+def load_github_data():
     if not os.path.exists(GITHUB_DATA_PATH):
-        return
+        return []
     with open(GITHUB_DATA_PATH, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        if isinstance(data, list):
-            items = data
-        elif isinstance(data, dict):
-            items = data.get(key, [])
-        else:
-            items = []
-    with open(flat_path, 'w', encoding='utf-8') as f:
-        json.dump({key: items}, f, indent=2)
+        return json.load(f)
 
 
-PRS_FLAT_PATH = os.path.join(BASE_DIR, "data", "github", "prs_flat.json")
-DISCUSSIONS_FLAT_PATH = os.path.join(BASE_DIR, "data", "github", "discussions_flat.json")
-FILES_FLAT_PATH = os.path.join(BASE_DIR, "data", "github", "files_flat.json")
-
-flatten_and_write("prs", PRS_FLAT_PATH)
-flatten_and_write("discussions", DISCUSSIONS_FLAT_PATH)
-flatten_and_write("files", FILES_FLAT_PATH)
-
-
-def make_github_agent(collection_name, persist_dir, json_list_key, text_formatter, json_path):
+def github_items(data, key):
+    """
+    Collect `key` items ("prs", "discussions", "files") from parsed github.json,
+    which is either a single dict or a list of team/repo blocks. Team-level
+    `git_activity` entries are PRs. Block context (team, project, repo) is
+    copied onto each item.
+    """
+    blocks = data if isinstance(data, list) else [data]
+    items = []
+    for block in blocks:
+        if not isinstance(block, dict):
+            continue
+        block_items = list(block.get(key, []))
+        if key == "prs":
+            block_items.extend(block.get("git_activity", []))
+        for item in block_items:
+            for field in ("team", "project", "repo"):
+                if block.get(field) is not None:
+                    item.setdefault(field, block[field])
+            items.append(item)
+    return items
+
+
+def github_loader(key):
+    """Record loader that re-reads github.json, so re-indexing picks up source changes."""
+    return lambda: github_items(load_github_data(), key)
+
+
+# Listings and exact identifiers (e.g. "PR-101", "DISC-301") read github.json on
+# first use and again whenever their collection is re-indexed
+pr_records = SourceRecords(github_loader("prs"), "github_prs")
+discussion_records = SourceRecords(github_loader("discussions"), "github_discussions")
+pr_id_index = RecordIdIndex(id_fields=("id", "pr_id"), source=pr_records)
+discussion_id_index = RecordIdIndex(id_fields=("id",), source=discussion_records)
+
+
+def make_github_agent(collection_name, persist_dir, text_formatter, records=None, **kwargs):
+    if records is not None:
+        kwargs.setdefault("record_loader", lambda: records)
     return VectorDBAgent(
-        json_path=json_path,
         collection_name=collection_name,
         persist_dir=persist_dir,
-        json_list_key=json_list_key,
-        text_formatter=text_formatter
+        text_formatter=text_formatter,
+        **kwargs
     )
 
 
@@ -58,7 +87,7 @@ def github_pr_text_formatter(pr):
         f"Title: {pr.get('title', '')}",
         f"Description: {pr.get('description', '')}",
         f"Status: {pr.get('status', '')}",
-        f"Author: {pr.get('created_by', {}).get('name', '')}",
+        f"Author: {pr.get('created_by', {}).get('name', pr.get('author', ''))}",
         f"Created At: {pr.get('created_at', '')}",
         f"URL: {pr.get('url', '')}"
     ]
@@ -68,30 +97,33 @@ def github_pr_text_formatter(pr):
 def github_pr_metadata(pr):
     # Keep metadata minimal to avoid large chunks
     return {
-        "id": pr.get("id"),
+        "id": pr.get("id", pr.get("pr_id")),
         "title": pr.get("title"),
         "status": pr.get("status"),
-        "author": pr.get("created_by", {}).get("name"),
+        "author": pr.get("created_by", {}).get("name", pr.get("author")),
         "created_at": pr.get("created_at"),
         "url": pr.get("url"),
     }
 
 
-github_pr_agent = make_github_agent(
+github_pr_agent = register_index("github_prs", "github", partial(make_github_agent,
     collection_name="github_prs",
     persist_dir="chroma_store/chroma_github_prs",
-    json_list_key="prs",
     text_formatter=github_pr_text_formatter,
-    json_path=PRS_FLAT_PATH
-)
+    record_loader=github_loader("prs")
+))
 
 
-def fetch_github_prs(query: str, k: int = 3):
+@compacted_tool("github")
+@speculative("github")
+@cached_tool("github_prs")
+def fetch_github_prs(query: str, k: int = 3, tool_context: ToolContext = None):
     """
     User Intent:
     - Return up to 'k' GitHub PRs based on user query.
     - If fewer than 'k' results are found, inform the user how many were found.
     - Provide detailed PR info: title, description, status, author, created_at, url.
+    - Results are limited to the session's team/project preferences when set.
     - If no results, apologize and suggest follow-up queries.
 
     Example:
@@ -103,21 +135,27 @@ def fetch_github_prs(query: str, k: int = 3):
         'list prs', 'list all prs', 'pull requests',
         'show pull requests', 'all pull requests', 'list pull requests',
     ]
+    filters = session_filters(tool_context)
     if query.strip().lower() in generic_phrases:
         if not os.path.exists(GITHUB_DATA_PATH):
             return [{"error": f"GitHub PR data not found at {GITHUB_DATA_PATH}"}]
-        with open(GITHUB_DATA_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            prs = data.get('prs', [])
-            limited = prs[:k]
-            response = [
-                {"text": github_pr_text_formatter(pr), "metadata": github_pr_metadata(pr)}
-                for pr in limited
-            ]
-            if len(limited) < k:
-                response.append({"info": f"Only {len(limited)} PRs found for your request."})
-            return response
-    results = github_pr_agent.query(query, top_k=k)
+        limited = [pr for pr in pr_records.get() if record_matches(pr, filters)][:k]
+        response = [
+            {"text": github_pr_text_formatter(pr), "metadata": github_pr_metadata(pr)}
+            for pr in limited
+        ]
+        if len(limited) < k:
+            response.append({"info": f"Only {len(limited)} PRs found for your request."})
+        return response
+    # Exact PR ids come straight from the in-memory index
+    exact = [
+        {"text": github_pr_text_formatter(pr), "score": 1.0, "match": "exact_id",
+         "metadata": github_pr_metadata(pr)}
+        for pr in pr_id_index.match(query, filters=filters, k=k)
+    ]
+    if exact and is_id_query(query):
+        return exact
+    results = pr_id_index.merge(exact, github_pr_agent.query(query, top_k=k, filters=filters), k)
     if len(results) < k:
         results.append({"info": f"Only {len(results)} PRs found for your request."})
     return results
@@ -130,7 +168,7 @@ def github_discussion_text_formatter(disc):
     details = [
         f"Title: {disc.get('title', '')}",
         f"Details: {disc.get('details', '')}",
-        f"Creator: {disc.get('created_by', {}).get('name', '')}",
+        f"Creator: {disc.get('created_by', {}).get('name', disc.get('author', ''))}",
         f"Created At: {disc.get('created_at', '')}",
         f"Status: {disc.get('status', '')}"
     ]
@@ -141,27 +179,29 @@ def github_discussion_metadata(disc):
     return {
         "id": disc.get("id"),
         "title": disc.get("title"),
-        "creator": disc.get("created_by", {}).get("name"),
+        "creator": disc.get("created_by", {}).get("name", disc.get("author")),
         "created_at": disc.get("created_at"),
         "status": disc.get("status"),
     }
 
 
-github_discussion_agent = make_github_agent(
+github_discussion_agent = register_index("github_discussions", "github", partial(make_github_agent,
     collection_name="github_discussions",
     persist_dir="chroma_store/chroma_github_discussions",
-    json_list_key="discussions",
     text_formatter=github_discussion_text_formatter,
-    json_path=DISCUSSIONS_FLAT_PATH
-)
+    record_loader=github_loader("discussions")
+))
 
 
-def fetch_github_discussions(query: str, k: int = 3):
+@compacted_tool("github")
+@cached_tool("github_discussions")
+def fetch_github_discussions(query: str, k: int = 3, tool_context: ToolContext = None):
     """
     User Intent:
     - Return up to 'k' GitHub discussions based on user query.
     - If fewer than 'k' results are found, inform the user how many were found.
     - Provide detailed discussion info: title, details, creator, created_at, status.
+    - Results are limited to the session's team/project preferences when set.
     - If no results, apologize and suggest follow-up queries.
 
     Example:
@@ -172,21 +212,27 @@ def fetch_github_discussions(query: str, k: int = 3):
         'list discussions', 'list all discussions', 'github discussions',
         'show github discussions', 'all github discussions', 'list github discussions',
     ]
+    filters = session_filters(tool_context)
     if query.strip().lower() in generic_phrases:
         if not os.path.exists(GITHUB_DATA_PATH):
             return [{"error": f"GitHub discussion data not found at {GITHUB_DATA_PATH}"}]
-        with open(GITHUB_DATA_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            discussions = data.get('discussions', [])
-            limited = discussions[:k]
-            response = [
-                {"text": github_discussion_text_formatter(disc), "metadata": github_discussion_metadata(disc)}
-                for disc in limited
-            ]
-            if len(limited) < k:
-                response.append({"info": f"Only {len(limited)} discussions found for your request."})
-            return response
-    results = github_discussion_agent.query(query, top_k=k)
+        limited = [disc for disc in discussion_records.get() if record_matches(disc, filters)][:k]
+        response = [
+            {"text": github_discussion_text_formatter(disc), "metadata": github_discussion_metadata(disc)}
+            for disc in limited
+        ]
+        if len(limited) < k:
+            response.append({"info": f"Only {len(limited)} discussions found for your request."})
+        return response
+    # Exact discussion ids come straight from the in-memory index
+    exact = [
+        {"text": github_discussion_text_formatter(disc), "score": 1.0, "match": "exact_id",
+         "metadata": github_discussion_metadata(disc)}
+        for disc in discussion_id_index.match(query, filters=filters, k=k)
+    ]
+    if exact and is_id_query(query):
+        return exact
+    results = discussion_id_index.merge(exact, github_discussion_agent.query(query, top_k=k, filters=filters), k)
     if len(results) < k:
         results.append({"info": f"Only {len(results)} discussions found for your request."})
     return results
@@ -220,27 +266,29 @@ def github_file_metadata(file):
     }
 
 
-github_file_agent = make_github_agent(
+github_file_agent = register_index("github_files", "github", partial(make_github_agent,
     collection_name="github_files",
     persist_dir="chroma_store/chroma_github_files",
-    json_list_key="files",
     text_formatter=github_file_text_formatter,
-    json_path=FILES_FLAT_PATH
-)
+    record_loader=github_loader("files")
+))
 
 
-def fetch_github_files(query: str, k: int = 3):
+@compacted_tool("github")
+@cached_tool("github_files")
+def fetch_github_files(query: str, k: int = 3, tool_context: ToolContext = None):
     """
     User Intent:
     - Return up to 'k' GitHub files based on user query.
     - If fewer than 'k' results are found, inform the user how many were found.
     - Provide detailed file info: path, preview, repository, type.
+    - Results are limited to the session's team/project preferences when set.
     - If no results, apologize and suggest follow-up queries.
 
     Example:
         "Show me 5 files related to booking"
     """
-    results = github_file_agent.query(query, top_k=k)
+    results = github_file_agent.query(query, top_k=k, filters=session_filters(tool_context))
     if len(results) < k:
         results.append({"info": f"Only {len(results)} files found for your request."})
     return results
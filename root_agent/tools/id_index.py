@@ -0,0 +1,112 @@
+# tools/id_index.py
+
+import re
+import threading
+
+from .filters import record_matches
+
+# Matches record identifiers such as INC-9101, PR-101, JIRA-1001 or DISC-301
+ID_PATTERN = re.compile(r"\b([A-Za-z][A-Za-z0-9]*-\d+)\b")
+
+
+def extract_ids(query):
+    """Return the identifiers mentioned in `query`, upper-cased, in order of appearance."""
+    seen = []
+    for match in ID_PATTERN.findall(query or ""):
+        record_id = match.upper()
+        if record_id not in seen:
+            seen.append(record_id)
+    return seen
+
+
+def is_id_query(query):
+    """True when `query` is nothing but identifiers, e.g. "INC-9101" or "PR-101, PR-102?"."""
+    return bool(extract_ids(query)) and not re.search(r"\w", ID_PATTERN.sub(" ", query))
+
+
+class RecordIdIndex:
+    """
+    In-memory inverted index from record identifiers to records, so exact ID
+    lookups can be answered without touching the embedding model or Chroma.
+    Given a SourceRecords `source`, it rebuilds itself whenever the source
+    reloads (i.e. its collection was re-indexed).
+    """
+
+    def __init__(self, records=(), id_fields=("id", "key", "pr_id"), source=None):
+        self.id_fields = tuple(id_fields)
+        self.source = source
+        self._records = {}
+        self._loaded_from = None
+        self._lock = threading.Lock()
+        for record in records:
+            self.add(record)
+
+    def refresh(self):
+        """Rebuild from `source` if it reloaded since the last build."""
+        if self.source is None:
+            return
+        records = self.source.get()
+        if records is self._loaded_from:
+            return
+        with self._lock:
+            if records is self._loaded_from:
+                return
+            # Build aside and swap, so concurrent lookups never see a partial index
+            index = {}
+            for record in records:
+                self._index(index, record)
+            self._records = index
+            self._loaded_from = records
+
+    def _index(self, records, record):
+        for field in self.id_fields:
+            value = record.get(field)
+            if value not in (None, ""):
+                records.setdefault(str(value).upper(), record)
+
+    def add(self, record):
+        self._index(self._records, record)
+
+    def get(self, record_id):
+        self.refresh()
+        return self._records.get(str(record_id).upper())
+
+    def record_key(self, record):
+        """The record's first non-empty identifier, upper-cased (None if it has none)."""
+        for field in self.id_fields:
+            value = record.get(field)
+            if value not in (None, ""):
+                return str(value).upper()
+        return None
+
+    def match(self, query, filters=None, k=None):
+        """
+        Records whose identifier appears in `query` and that satisfy `filters`
+        (see filters.record_matches), at most `k`; empty if none do.
+        """
+        self.refresh()
+        matches = []
+        for record_id in extract_ids(query):
+            record = self._records.get(record_id)
+            if record is not None and record not in matches and record_matches(record, filters):
+                matches.append(record)
+        return matches[:k]
+
+    def merge(self, exact, results, k):
+        """
+        Exact-match results ahead of vector `results`, skipping results for the
+        same records, at most `k` in all. Items carry the record in "metadata".
+        """
+        seen = {self.record_key(item["metadata"]) for item in exact}
+        merged = list(exact)
+        for item in results:
+            if len(merged) >= k:
+                break
+            key = self.record_key(item.get("metadata") or {})
+            if key is not None and key in seen:
+                continue
+            merged.append(item)
+        return merged
+
+    def __len__(self):
+        return len(self._records)
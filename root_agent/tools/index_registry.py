@@ -0,0 +1,144 @@
+# tools/index_registry.py
+
+import logging
+import threading
+import time
+
+from .result_cache import track_generation
+
+logger = logging.getLogger(__name__)
+
+# Index lifecycle states reported by /navo/ready
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class LazyIndex:
+    """
+    Thread-safe handle around a VectorDBAgent that is only built on first use.
+    The factory (typically a functools.partial of the constructor) runs at most
+    once at a time; a failed build is retried on the next call.
+    """
+
+    def __init__(self, name, source, factory):
+        self.name = name
+        self.source = source
+        self._factory = factory
+        self._agent = None
+        self._lock = threading.Lock()
+        self.state = PENDING
+        self.error = None
+        self.load_seconds = None
+
+    def get(self):
+        agent = self._agent
+        if agent is not None:
+            return agent
+        with self._lock:
+            if self._agent is None:
+                self.state = LOADING
+                self.error = None
+                started = time.perf_counter()
+                try:
+                    self._agent = self._factory()
+                except Exception as e:
+                    self.state = FAILED
+                    self.error = str(e)
+                    logger.exception(f"❌ Failed to load index {self.name}")
+                    raise
+                self.load_seconds = round(time.perf_counter() - started, 3)
+                self.state = READY
+                logger.info(f"✅ Index {self.name} ready in {self.load_seconds}s")
+        return self._agent
+
+    def create(self, **overrides):
+        """Build a fresh, unmanaged agent with constructor overrides (e.g. for bulk ingestion)."""
+        return self._factory(**overrides)
+
+    def is_loaded(self):
+        return self._agent is not None
+
+    def query(self, *args, **kwargs):
+        return self.get().query(*args, **kwargs)
+
+    def status(self):
+        return {
+            "source": self.source,
+            "state": self.state,
+            "load_seconds": self.load_seconds,
+            "error": self.error,
+        }
+
+
+_indexes = {}
+_registry_lock = threading.Lock()
+_warmup_thread = None
+
+
+def register_index(name, source, factory):
+    """
+    Register (or return the already registered) lazy index `name` for `source`.
+    When the factory is a partial naming its persist_dir, the collection's
+    generation stamp is tracked from now on, before the index is first built.
+    """
+    with _registry_lock:
+        if name not in _indexes:
+            _indexes[name] = LazyIndex(name, source, factory)
+            keywords = getattr(factory, "keywords", {})
+            if keywords.get("persist_dir"):
+                track_generation(keywords.get("collection_name", name), keywords["persist_dir"])
+        return _indexes[name]
+
+
+def get_index(name):
+    return _indexes[name]
+
+
+def list_indexes():
+    return list(_indexes.values())
+
+
+def index_status():
+    return {name: index.status() for name, index in _indexes.items()}
+
+
+def is_warming_up():
+    return _warmup_thread is not None and _warmup_thread.is_alive()
+
+
+def _ordered_for_warmup(preferred_sources):
+    preferred = [s.lower() for s in (preferred_sources or [])]
+    rank = {source: i for i, source in enumerate(preferred)}
+    return sorted(list_indexes(), key=lambda idx: rank.get(idx.source, len(rank)))
+
+
+def _warm(indexes):
+    for index in indexes:
+        try:
+            index.get()
+        except Exception:
+            # Already logged by LazyIndex; keep warming the remaining sources
+            continue
+
+
+def warm_up(preferred_sources=None, background=True):
+    """
+    Load every registered index, starting with `preferred_sources`
+    (e.g. the warmup_order setting). Runs in a daemon thread by default.
+    """
+    global _warmup_thread
+    indexes = _ordered_for_warmup(preferred_sources)
+    logger.info(f"🔥 Warming up indexes: {[idx.name for idx in indexes]}")
+    if not background:
+        _warm(indexes)
+        return None
+    with _registry_lock:
+        if is_warming_up():
+            return _warmup_thread
+        _warmup_thread = threading.Thread(
+            target=_warm, args=(indexes,), name="navo-index-warmup", daemon=True
+        )
+        _warmup_thread.start()
+        return _warmup_thread
@@ -0,0 +1,55 @@
+# tools/ingest.py
+"""
+Stream a large source export into one of the registered indexes.
+
+Records are read incrementally from a JSON array, a JSON object holding an
+array under --list-key, or a JSONL file, and are formatted with the index's
+own text formatter.
+
+Usage:
+    python -m root_agent.tools.ingest jira_issues /exports/jira.jsonl
+    python -m root_agent.tools.ingest servicenow_incidents incidents.json --list-key incidents --mode sync
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from .index_registry import get_index, list_indexes
+from .streaming import iter_json_records
+# Importing the tool modules registers their indexes
+from . import github_tool, jira_tool, confluence_tool, servicenow_tool  # noqa: F401
+
+
+def ingest_file(index_name, path, list_key=None, mode="append", batch_size=None):
+    """
+    mode="append": embed every record in the file into the existing collection.
+    mode="sync": upsert new/changed records and delete ones missing from the file.
+    """
+    loader = lambda: iter_json_records(path, list_key)
+    index = get_index(index_name)
+    if mode == "sync":
+        agent = index.create(record_loader=loader, index_mode="open", batch_size=batch_size)
+        return agent.sync()
+    agent = index.create(record_loader=loader, index_mode="open")
+    return agent.ingest(batch_size=batch_size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a source export into a Navo vector store.")
+    parser.add_argument("index", choices=[index.name for index in list_indexes()])
+    parser.add_argument("path", help="JSON array, JSON object or JSONL file")
+    parser.add_argument("--list-key", default=None, help="Key of the record array inside a JSON object")
+    parser.add_argument("--mode", choices=["append", "sync"], default="append")
+    parser.add_argument("--batch-size", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    report = ingest_file(args.index, args.path, args.list_key, args.mode, args.batch_size)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,34 +1,63 @@
 import os
+from functools import partial
 import json
+from google.adk.tools.tool_context import ToolContext
 from .vector_db_agent import VectorDBAgent
+from .index_registry import register_index
+from .result_cache import cached_tool
+from .compaction import compacted_tool
+from .speculation import speculative
+from .id_index import RecordIdIndex, is_id_query
+from .source_records import SourceRecords
+from .filters import record_matches, session_filters
 from root_agent.utils.preferences import PreferencesUtil
 
 # Use absolute path to ensure correct file loading
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 JIRA_DATA_PATH = os.path.join(BASE_DIR, "data", "jira", "all_issues.json")
-FLATTENED_PATH = os.path.join(BASE_DIR, "data", "jira", "all_issues_flat.json")
+
+# Issue groups in all_issues.json; "jira_issues" holds the untyped export
+ISSUE_GROUPS = ['epics', 'stories', 'bugs', 'tasks', 'jira_issues']
+JIRA_ID_FIELDS = ("id", "key", "jira_id")
+ISSUE_TYPES = {'epics': 'Epic', 'stories': 'Story', 'bugs': 'Bug', 'tasks': 'Task'}
 
 # Debug: Print the path being used
 print(f"Jira tool loading data from: {JIRA_DATA_PATH}")
 print(f"File exists: {os.path.exists(JIRA_DATA_PATH)}")
 
-def get_all_issues():
+def get_issue_groups():
     if not os.path.exists(JIRA_DATA_PATH):
-        return []
+        return {}
     with open(JIRA_DATA_PATH, 'r', encoding='utf-8') as f:
         data = json.load(f)
-        all_issues = []
-        for k in ['epics', 'stories', 'bugs', 'tasks']:
-            all_issues.extend(data.get(k, []))
-        return all_issues
+        groups = {}
+        for k in ISSUE_GROUPS:
+            groups[k] = []
+            for issue in data.get(k, []):
+                # Carry team/project and the group's issue type for filtering
+                for field in ("team", "project"):
+                    if data.get(field) is not None:
+                        issue.setdefault(field, data[field])
+                if k in ISSUE_TYPES:
+                    issue.setdefault("type", ISSUE_TYPES[k])
+                groups[k].append(issue)
+        return groups
+
+def flatten_issue_groups(groups):
+    return [issue for k in ISSUE_GROUPS for issue in groups.get(k, [])]
 
-flattened_issues = get_all_issues()
-with open(FLATTENED_PATH, 'w', encoding='utf-8') as f:
-    json.dump({"issues": flattened_issues}, f, ensure_ascii=False, indent=2)
+def load_issues():
+    # Re-reads all_issues.json, so re-indexing picks up source changes
+    return flatten_issue_groups(get_issue_groups())
+
+# Listings and exact issue keys (e.g. "JIRA-1001") read all_issues.json on first
+# use and again whenever jira_issues is re-indexed
+issue_groups = SourceRecords(get_issue_groups, "jira_issues")
+issue_id_index = RecordIdIndex(id_fields=JIRA_ID_FIELDS, source=SourceRecords(load_issues, "jira_issues"))
 
 def jira_text_formatter(issue):
     details = [
-        f"Key: {issue.get('id', issue.get('key', ''))}",
+        f"Key: {issue.get('id', issue.get('key', issue.get('jira_id', '')))}",
         f"Title: {issue.get('title', issue.get('summary', ''))}",
         f"Status: {issue.get('status', '')}",
         f"Assignee: {issue.get('assignee', '')}",
@@ -44,15 +73,18 @@ def jira_text_formatter(issue):
         details.append(f"Comments:\n{comments}")
     return "\n".join(details)
 
-jira_agent = VectorDBAgent(
-    json_path=FLATTENED_PATH,
+jira_agent = register_index("jira_issues", "jira", partial(VectorDBAgent,
     collection_name="jira_issues",
     persist_dir="chroma_store/chroma_jira",
-    json_list_key="issues",
-    text_formatter=jira_text_formatter
-)
+    text_formatter=jira_text_formatter,
+    record_loader=load_issues,
+    id_fields=JIRA_ID_FIELDS
+))
 
-def fetch_jira_issues(query: str, k: int = 3):
+@compacted_tool("jira")
+@speculative("jira")
+@cached_tool("jira_issues")
+def fetch_jira_issues(query: str, k: int = 3, tool_context: ToolContext = None):
     """
     User Intent:
     - Return up to 'k' Jira issues based on user query.
@@ -60,6 +92,7 @@ def fetch_jira_issues(query: str, k: int = 3):
     - Provide detailed information for each issue, including key, title, status, assignee, description, and any relevant metadata.
     - If the user asks for a specific type (e.g., "all bugs"), return all matching issues.
     - If no results are found, apologize and suggest possible follow-up queries.
+    - Results are limited to the session's team/project preferences when set.
 
     Example:
         "Bring me any 5 results from Jira"
@@ -82,33 +115,35 @@ def fetch_jira_issues(query: str, k: int = 3):
         '': None
     }
     q = query.strip().lower()
-    import json
+    filters = session_filters(tool_context)
     if q in generic_types:
         issue_type = generic_types[q]
         if not os.path.exists(JIRA_DATA_PATH):
             return [{"error": f"Jira data not found at {JIRA_DATA_PATH}"}]
-        with open(JIRA_DATA_PATH, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            if issue_type:
-                issues = data.get(issue_type, [])
-            else:
-                issues = []
-                for ktype in ['epics', 'stories', 'bugs', 'tasks']:
-                    issues.extend(data.get(ktype, []))
-            limited = issues[:k]
-            response = []
-            for issue in limited:
-                response.append({
-                    "text": jira_text_formatter(issue),
-                    "metadata": issue
-                })
-            if len(limited) < k:
-                response.append({
-                    "info": f"Only {len(limited)} results found for your request."
-                })
-            return response
-    # Otherwise, do a vector search
-    results = jira_agent.query(query, top_k=k)
+        groups = issue_groups.get()
+        issues = groups.get(issue_type, []) if issue_type else flatten_issue_groups(groups)
+        limited = [issue for issue in issues if record_matches(issue, filters)][:k]
+        response = []
+        for issue in limited:
+            response.append({
+                "text": jira_text_formatter(issue),
+                "metadata": issue
+            })
+        if len(limited) < k:
+            response.append({
+                "info": f"Only {len(limited)} results found for your request."
+            })
+        return response
+    # Exact issue keys come straight from the in-memory index
+    exact = [
+        {"text": jira_text_formatter(issue), "score": 1.0, "match": "exact_id",
+         "metadata": VectorDBAgent.flatten_metadata(issue)}
+        for issue in issue_id_index.match(query, filters=filters, k=k)
+    ]
+    if exact and is_id_query(query):
+        return exact
+    # Otherwise, do a vector search, exact matches first
+    results = issue_id_index.merge(exact, jira_agent.query(query, top_k=k, filters=filters), k)
     if len(results) < k:
         results.append({"info": f"Only {len(results)} results found for your request."})
     return results
\ No newline at end of file
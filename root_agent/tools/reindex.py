@@ -0,0 +1,38 @@
+# tools/reindex.py
+"""
+Incrementally re-index the vector stores from the current source JSON.
+
+Usage:
+    python -m root_agent.tools.reindex                  # every index
+    python -m root_agent.tools.reindex jira_issues ...  # selected indexes
+"""
+
+import argparse
+import json
+import logging
+import sys
+
+from .index_registry import get_index, list_indexes
+# Importing the tool modules registers their indexes
+from . import github_tool, jira_tool, confluence_tool, servicenow_tool  # noqa: F401
+
+
+def reindex(names=None):
+    indexes = [get_index(name) for name in names] if names else list_indexes()
+    # "open" skips the startup build/sync, so each collection is synced exactly once
+    return {index.name: index.create(index_mode="open").sync() for index in indexes}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incrementally re-index Navo vector stores.")
+    parser.add_argument("indexes", nargs="*", help="Index names (default: all registered indexes)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    report = reindex(args.indexes)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
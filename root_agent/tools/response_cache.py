@@ -0,0 +1,154 @@
+# tools/response_cache.py
+"""
+Semantic cache of final chat answers. Paraphrased questions ("why did flight
+status API go down" / "flight status outage root cause") embed close to each
+other, so an answer is reused when a new query is within the similarity
+threshold of a cached one asked with the same tool/role/team/project
+preferences. Entries expire after a TTL and are dropped when any collection
+they could draw on is re-indexed. Only context-free turns (a session's first
+question) are looked up or stored: a follow-up such as "what's its status?"
+depends on earlier turns the cache key does not capture.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from root_agent.agent import normalize_tools
+from root_agent.config.config_loader import get_bool_setting, get_float_setting, get_int_setting
+from root_agent.tools.embedding_registry import DEFAULT_EMBED_MODEL, get_embed_model, get_query_embedding
+from root_agent.tools.index_registry import list_indexes
+from root_agent.tools.result_cache import current_generations
+from root_agent.tools.similarity import dot, normalize_text, unit_vector
+
+logger = logging.getLogger(__name__)
+
+
+def preference_scope(state):
+    """Normalized (tools, role, team, project) of the session an answer was produced in."""
+    tools = normalize_tools(state.get("tool"))
+    return (tools,) + tuple(normalize_text(state.get(name) or "") for name in ("role", "team", "project"))
+
+
+def scope_collections(scope):
+    """Collections an answer for `scope` may depend on (all of them when no tool is selected)."""
+    tools = scope[0]
+    return tuple(sorted(index.name for index in list_indexes() if not tools or index.source in tools))
+
+
+class SemanticResponseCache:
+    """
+    LRU of answers keyed by (preference scope, normalized query). A lookup
+    compares the query embedding with every live entry of the same scope;
+    with `max_entries` in the hundreds that scan costs far less than one
+    model call.
+    """
+
+    def __init__(self, threshold=0.92, ttl_seconds=300.0, max_entries=256, embed_model_name=DEFAULT_EMBED_MODEL):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.embed_model_name = embed_model_name
+        # (scope, query) -> (expires_at, generations, vector, answer), oldest first
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def embed(self, query):
+        embed_model = get_embed_model(self.embed_model_name)
+        # Same text as the router embeds, so the query vector cache serves both
+        return unit_vector(get_query_embedding(self.embed_model_name, embed_model, query))
+
+    def lookup(self, query, state):
+        """
+        Return (answer, probe). `answer` is the cached text or None; pass
+        `probe` to store() after a miss so the answer is filed under the
+        embedding and collection generations seen before the run.
+        """
+        scope = preference_scope(state)
+        generations = current_generations(scope_collections(scope))
+        vector = self.embed(query)
+        probe = (scope, normalize_text(query), generations, vector)
+
+        now = time.monotonic()
+        best_key, best_score = None, self.threshold
+        with self._lock:
+            for key, (expires_at, cached_generations, cached_vector, _) in list(self._entries.items()):
+                if key[0] != scope:
+                    continue
+                if expires_at < now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    continue
+                if cached_generations != generations:
+                    del self._entries[key]
+                    self.invalidations += 1
+                    continue
+                score = dot(vector, cached_vector)
+                if score >= best_score:
+                    best_key, best_score = key, score
+            if best_key is None:
+                self.misses += 1
+                return None, probe
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            answer = self._entries[best_key][3]
+        logger.info(f"♻️ Semantic cache hit ({round(best_score, 4)}) for {query!r}, cached as {best_key[1]!r}")
+        return answer, probe
+
+    def store(self, probe, answer):
+        scope, query, generations, vector = probe
+        with self._lock:
+            self._entries[(scope, query)] = (time.monotonic() + self.ttl_seconds, generations, vector, answer)
+            self._entries.move_to_end((scope, query))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+response_cache = SemanticResponseCache(
+    threshold=get_float_setting("response_cache_threshold", 0.92),
+    ttl_seconds=get_float_setting("response_cache_ttl_seconds", 300.0),
+    max_entries=get_int_setting("response_cache_size", 256),
+)
+
+
+def lookup_response(query, state):
+    """(answer, probe) from the response cache; (None, None) when disabled or unavailable."""
+    if not get_bool_setting("response_cache", False):
+        return None, None
+    try:
+        return response_cache.lookup(query, state)
+    except Exception:
+        # Never fail a chat turn because of the cache; run the agents as usual
+        logger.exception("❌ Semantic cache lookup failed; running the agents")
+        return None, None
+
+
+def store_response(probe, answer):
+    if probe is not None and answer:
+        response_cache.store(probe, answer)
@@ -0,0 +1,178 @@
+# tools/result_cache.py
+
+import copy
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from root_agent.config.config_loader import get_float_setting, get_int_setting
+from .filters import session_filters
+from .similarity import normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Per-collection generations. Re-indexing a collection bumps its generation,
+# which invalidates every cached result that depended on it. A collection with
+# a known persist_dir also gets a stamp file next to its Chroma store, rewritten
+# on every bump and checked on lookup, so a re-index or ingest run by another
+# process (e.g. python -m root_agent.tools.reindex) invalidates this one's caches.
+GENERATION_STAMP_SUFFIX = ".generation"
+
+_generations = {}
+_stamp_paths = {}
+_generations_lock = threading.Lock()
+
+
+def generation_stamp_path(collection_name, persist_dir):
+    return os.path.join(persist_dir, f"{collection_name}{GENERATION_STAMP_SUFFIX}")
+
+
+def track_generation(collection_name, persist_dir):
+    """
+    Persist `collection_name`'s generation in a stamp file under `persist_dir`.
+    The first registration wins, so an agent created with another persist_dir
+    for the same collection name can't redirect a registered index's stamp.
+    """
+    with _generations_lock:
+        _stamp_paths.setdefault(collection_name, generation_stamp_path(collection_name, persist_dir))
+
+
+def _write_stamp(path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(str(time.time_ns()))
+    # Atomic replace: readers see the old or the new stamp, and a new inode either way
+    os.replace(tmp_path, path)
+
+
+def _stamp(collection_name):
+    path = _stamp_paths.get(collection_name)
+    if path is None:
+        return None
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns)
+
+
+def bump_generation(collection_name):
+    with _generations_lock:
+        _generations[collection_name] = _generations.get(collection_name, 0) + 1
+        path = _stamp_paths.get(collection_name)
+        if path is not None:
+            try:
+                _write_stamp(path)
+            except OSError:
+                logger.exception(f"❌ Could not write generation stamp {path}")
+        return _generations[collection_name]
+
+
+def current_generations(collection_names):
+    return tuple((_generations.get(name, 0), _stamp(name)) for name in collection_names)
+
+
+class TTLResultCache:
+    """Size-bounded LRU of tool results with a per-entry TTL."""
+
+    def __init__(self, ttl_seconds=60.0, max_entries=512):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, generations, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def get(self, key, generations):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, cached_generations, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            if cached_generations != generations:
+                del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, generations, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, generations, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+result_cache = TTLResultCache(
+    ttl_seconds=get_float_setting("result_cache_ttl_seconds", 60.0),
+    max_entries=get_int_setting("result_cache_size", 512),
+)
+
+
+def cached_tool(*collection_names):
+    """
+    Cache a fetch_* tool's results by its (normalized) arguments. Entries
+    expire after the TTL and are dropped as soon as any of `collection_names`
+    is re-indexed. The ADK `tool_context` is replaced in the key by the session
+    filters it implies. Callers always receive a copy they can safely mutate.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            tool_context = bound.arguments.pop("tool_context", None)
+            key = (func.__module__, func.__qualname__) + tuple(
+                (name, normalize_text(value)) for name, value in bound.arguments.items()
+            ) + tuple(
+                (f"session_{name}", normalize_text(value))
+                for name, value in sorted(session_filters(tool_context).items())
+            )
+            generations = current_generations(collection_names)
+            cached = result_cache.get(key, generations)
+            if cached is not None:
+                return copy.deepcopy(cached)
+            result = func(*args, **kwargs)
+            result_cache.put(key, generations, copy.deepcopy(result))
+            return result
+
+        return wrapper
+    return decorator
@@ -0,0 +1,173 @@
+# tools/router.py
+"""
+Local intent router. Each source has a handful of labelled example queries;
+their embeddings (from the shared sentence-transformer) are averaged into one
+centroid per label. A query is routed by cosine similarity to the centroids in
+a few milliseconds; below the confidence threshold the root LLM routes as before.
+"""
+
+import logging
+import threading
+import time
+
+from root_agent.config.config_loader import get_bool_setting, get_float_setting
+from root_agent.tools.embedding_registry import DEFAULT_EMBED_MODEL, get_embed_model, get_query_embedding
+from root_agent.tools.similarity import dot, mean_vector, unit_vector
+
+logger = logging.getLogger(__name__)
+
+# Queries the LLM should answer itself (greetings, general tool knowledge)
+GENERAL = "general"
+
+ROUTE_EXAMPLES = {
+    "github": [
+        "Find similar PRs where we solved retry logic issues in Kafka consumers",
+        "Find PRs that mention circuit breaker patterns",
+        "Show open pull requests for the booking service",
+        "Who merged the commit that changed the payment client?",
+        "List GitHub discussions about OAuth2 integration",
+        "Give me a walkthrough of the repo structure",
+        "Explain the code in the orders migration file",
+        "Which PR added the index on the users table?",
+    ],
+    "jira": [
+        "Show Jira tickets related to payment gateway timeouts",
+        "List open bugs assigned to the cargo team",
+        "Which stories are in the current sprint?",
+        "Find issues similar to the login redirect bug",
+        "What is the status of the ticket for invoice export?",
+        "Show blocked Jira issues with high priority",
+        "List epics and tasks for the tracking project",
+        "Find backlog items about notification emails",
+    ],
+    "confluence": [
+        "Search Confluence for architecture docs on async order processing",
+        "Find the onboarding guide for new engineers",
+        "Show the runbook for the booking service",
+        "Where is the design doc for the pricing engine?",
+        "Find API documentation for the shipment endpoints",
+        "Show the wiki page describing our deployment process",
+        "Find the retrospective notes from last release",
+        "Give me an overview of the system architecture",
+    ],
+    "servicenow": [
+        "Retrieve ServiceNow incidents linked to login failures",
+        "Show recent outages in the payment service",
+        "What was the root cause of the last production incident?",
+        "List critical incidents from last week",
+        "How was the database connection pool incident resolved?",
+        "Find incidents with SLA breaches",
+        "Show change requests related to the gateway",
+        "Which incidents affected container tracking?",
+    ],
+    GENERAL: [
+        "hi",
+        "hello there",
+        "good morning",
+        "thanks, that helps",
+        "what is GitHub?",
+        "how do I raise a PR?",
+        "what is Confluence used for?",
+        "what can you help me with?",
+    ],
+}
+
+
+class IntentRouter:
+    """
+    Nearest-centroid router over ROUTE_EXAMPLES. route() returns a decision dict:
+    {"sources": [...], "confidence": float, "scores": {label: cosine},
+     "fallback": bool, "reason": str, "seconds": float}
+    "sources" holds every source within `margin` of the best one (multi-source
+    queries), and is empty when the router defers to the LLM.
+    """
+
+    def __init__(self, examples=None, embed_model_name=DEFAULT_EMBED_MODEL, threshold=0.45, margin=0.05):
+        self.examples = examples or ROUTE_EXAMPLES
+        self.embed_model_name = embed_model_name
+        self.threshold = threshold
+        self.margin = margin
+        self._centroids = None
+        self._lock = threading.Lock()
+
+    def _get_centroids(self):
+        if self._centroids is None:
+            with self._lock:
+                if self._centroids is None:
+                    embed_model = get_embed_model(self.embed_model_name)
+                    self._centroids = {
+                        label: unit_vector(mean_vector([unit_vector(v) for v in embed_model.get_text_embedding_batch(texts)]))
+                        for label, texts in self.examples.items()
+                    }
+        return self._centroids
+
+    def warm_up(self):
+        """Load the embedding model and build the centroids ahead of the first query."""
+        self._get_centroids()
+
+    def scores(self, query):
+        embed_model = get_embed_model(self.embed_model_name)
+        vector = unit_vector(get_query_embedding(self.embed_model_name, embed_model, query))
+        return {label: round(dot(vector, centroid), 4) for label, centroid in self._get_centroids().items()}
+
+    def route(self, query):
+        started = time.perf_counter()
+        scores = self.scores(query)
+        best_label, confidence = max(scores.items(), key=lambda item: item[1])
+        decision = {"sources": [], "confidence": confidence, "scores": scores, "fallback": True}
+
+        if confidence < self.threshold:
+            decision["reason"] = "low_confidence"
+        elif best_label == GENERAL:
+            decision["reason"] = GENERAL
+        else:
+            decision["fallback"] = False
+            decision["reason"] = "centroid"
+            decision["sources"] = [
+                label for label, score in sorted(scores.items(), key=lambda item: -item[1])
+                if label != GENERAL and score >= self.threshold and score >= confidence - self.margin
+            ]
+        decision["seconds"] = round(time.perf_counter() - started, 4)
+        logger.info(
+            f"🧭 Route {decision['sources'] or 'LLM'} ({decision['reason']}, "
+            f"confidence {confidence}, {decision['seconds']}s) for query: {query!r}"
+        )
+        return decision
+
+
+intent_router = IntentRouter(
+    threshold=get_float_setting("router_threshold", 0.45),
+    margin=get_float_setting("router_margin", 0.05),
+)
+
+
+def route_query(query):
+    """Router decision for `query`, or None when the router is disabled or unavailable."""
+    if not get_bool_setting("router", True):
+        return None
+    try:
+        return intent_router.route(query)
+    except Exception:
+        # Never fail a chat turn because of routing; the root LLM still routes
+        logger.exception("❌ Intent routing failed; falling back to the LLM")
+        return None
+
+
+def warm_up_router(background=True):
+    """Build the router's centroids (loading the embedding model), in a daemon thread by default."""
+    if not get_bool_setting("router", True):
+        return None
+
+    def warm():
+        try:
+            intent_router.warm_up()
+        except Exception:
+            # route_query retries (and falls back to the LLM) on the first query
+            logger.exception("❌ Intent router warm-up failed")
+
+    if not background:
+        warm()
+        return None
+    thread = threading.Thread(target=warm, name="navo-router-warmup", daemon=True)
+    thread.start()
+    return thread
@@ -1,12 +1,20 @@
 import os
+from functools import partial
 import json
+from google.adk.tools.tool_context import ToolContext
 from .vector_db_agent import VectorDBAgent
+from .index_registry import register_index
+from .result_cache import cached_tool
+from .compaction import compacted_tool
+from .speculation import speculative
+from .id_index import RecordIdIndex, is_id_query
+from .source_records import SourceRecords
+from .filters import session_filters
 from root_agent.utils.preferences import PreferencesUtil
 
 # Base path
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
 SERVICENOW_DATA_PATH = os.path.join(BASE_DIR, "data", "servicenow", "incidents.json")
-FLATTENED_PATH = os.path.join(BASE_DIR, "data", "servicenow", "incidents_flat.json")
 
 print(f"ServiceNow tool loading data from: {SERVICENOW_DATA_PATH}")
 print(f"File exists: {os.path.exists(SERVICENOW_DATA_PATH)}")
@@ -20,14 +28,19 @@ def load_flattened_incidents(json_path):
         incidents = entry.get("incidents", [])
         for inc in incidents:
             # Optionally add team/project info to incident metadata
-            inc["team"] = entry.get("team")
-            inc["project"] = entry.get("project")
+            for field in ("team", "project"):
+                if entry.get(field) is not None:
+                    inc[field] = entry[field]
             all_incidents.append(inc)
     return all_incidents
 
-flattened_incidents = load_flattened_incidents(SERVICENOW_DATA_PATH)
-with open(FLATTENED_PATH, "w", encoding="utf-8") as f:
-    json.dump({"incidents": flattened_incidents}, f, indent=2)
+def load_incidents():
+    # Re-reads incidents.json, so re-indexing picks up source changes
+    return load_flattened_incidents(SERVICENOW_DATA_PATH)
+
+# Exact incident numbers (e.g. "INC-9101") bypass vector search; the index is
+# rebuilt from incidents.json whenever servicenow_incidents is re-indexed
+incident_id_index = RecordIdIndex(id_fields=("id",), source=SourceRecords(load_incidents, "servicenow_incidents"))
 
 # Formatter for embedding
 def servicenow_text_formatter(inc):
@@ -55,17 +68,19 @@ def servicenow_text_formatter(inc):
     ]
     return "\n".join(details)
 
-# Initialize the vector DB agent
-servicenow_agent = VectorDBAgent(
-    json_path=FLATTENED_PATH,          # Path to the flattened JSON
-    json_list_key="incidents",         # Key inside the JSON file to extract incidents
+# Vector DB agent, built on first query (or by the startup warm-up)
+servicenow_agent = register_index("servicenow_incidents", "servicenow", partial(VectorDBAgent,
     collection_name="servicenow_incidents",
     persist_dir="chroma_store/chroma_servicenow",
-    text_formatter=servicenow_text_formatter
-)
+    text_formatter=servicenow_text_formatter,
+    record_loader=load_incidents  # Flattened incidents, read fresh on every (re-)index
+))
 
 # Query function
-def fetch_servicenow_incidents(query: str, k: int = 3):
+@compacted_tool("servicenow")
+@speculative("servicenow")
+@cached_tool("servicenow_incidents")
+def fetch_servicenow_incidents(query: str, k: int = 3, tool_context: ToolContext = None):
     """
     Multi-tool Incident Search Prompt:
 
@@ -84,6 +99,8 @@ def fetch_servicenow_incidents(query: str, k: int = 3):
     - Supporting documentation from Confluence.
     - Any cross-references or links between tools.
 
+    Results are limited to the session's team/project preferences when set.
+
     This enables users to get a full picture of the incident, its resolution, and all related activities across your engineering stack.
 
     Example usage:
@@ -91,7 +108,21 @@ def fetch_servicenow_incidents(query: str, k: int = 3):
         fetch_servicenow_incidents("Why did the Flight Status API go down?")
     """
 
-    results = servicenow_agent.query(query, top_k=k)
+    filters = session_filters(tool_context)
+    # Exact incident numbers come straight from the in-memory index
+    exact = [
+        {
+            "score": 1.0,
+            "match": "exact_id",
+            "incident_summary": servicenow_text_formatter(inc),
+            "metadata": VectorDBAgent.flatten_metadata(inc),
+        }
+        for inc in incident_id_index.match(query, filters=filters, k=k)
+    ]
+    if exact and is_id_query(query):
+        return exact
+
+    results = servicenow_agent.query(query, top_k=k, filters=filters)
     formatted = []
     for r in results:
         formatted.append({
@@ -99,5 +130,4 @@ def fetch_servicenow_incidents(query: str, k: int = 3):
             "incident_summary": r["text"],
             "metadata": r["metadata"],
         })
-    return formatted
-    return formatted
+    return incident_id_index.merge(exact, formatted, k)
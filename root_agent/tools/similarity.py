@@ -0,0 +1,25 @@
+# tools/similarity.py
+"""Small text/vector helpers shared by the router and the caches (no numpy dependency)."""
+
+import math
+import re
+
+
+def normalize_text(value):
+    """Collapse whitespace and casefold strings (for cache keys); other values pass through."""
+    if isinstance(value, str):
+        return re.sub(r"\s+", " ", value).strip().casefold()
+    return value
+
+
+def unit_vector(vector):
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+def mean_vector(vectors):
+    return [sum(values) / len(vectors) for values in zip(*vectors)]
+
+
+def dot(a, b):
+    return sum(x * y for x, y in zip(a, b))
@@ -0,0 +1,30 @@
+# tools/source_records.py
+
+import threading
+
+from .result_cache import current_generations
+
+
+class SourceRecords:
+    """
+    Records parsed from a tool's source file, loaded on first use and reloaded
+    whenever `collection_name` (the collection indexed from the same source)
+    is re-indexed, in this or another process. Listings and ID lookups read
+    through it, so they stay in step with the vector store.
+    """
+
+    def __init__(self, loader, collection_name):
+        self.loader = loader
+        self.collection_name = collection_name
+        self._records = None
+        self._generation = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        generation = current_generations((self.collection_name,))
+        if self._records is None or generation != self._generation:
+            with self._lock:
+                if self._records is None or generation != self._generation:
+                    self._records = self.loader()
+                    self._generation = generation
+        return self._records
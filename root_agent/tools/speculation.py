@@ -0,0 +1,208 @@
+# tools/speculation.py
+"""
+Speculative retrieval (opt-in, NAVO_SPECULATIVE_RETRIEVAL). When a chat turn
+starts, the likely sources' fetch_* searches are submitted to the tool pool
+with the raw user query, concurrently with the first model call. If the agent
+then calls that source's tool with a similar query, the completed (or still
+running) speculative result is returned instead of searching again.
+"""
+
+import contextvars
+import functools
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from root_agent.config.config_loader import get_bool_setting, get_float_setting, get_int_setting
+from .filters import session_filters
+from .router import route_query
+
+logger = logging.getLogger(__name__)
+
+# Turn whose speculative results the running tools may use
+_current_turn = contextvars.ContextVar("navo_speculative_turn", default=None)
+
+# source -> undecorated fetch_* used to start speculative searches
+_fetchers = {}
+
+# Separate from the tool pool: tools block on speculative futures, so sharing
+# one pool could leave every worker waiting on work queued behind it.
+speculation_executor = ThreadPoolExecutor(
+    max_workers=get_int_setting("speculative_workers", 4),
+    thread_name_prefix="navo-speculative",
+)
+
+
+def _tokens(text):
+    return {t for t in re.findall(r"\w+", text.casefold()) if len(t) > 2}
+
+
+class SpeculationStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.turns = 0
+        self.started = 0
+        self.served = 0
+        self.served_in_flight = 0
+        self.mismatched = 0
+        self.failed = 0
+        self.wasted = 0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "turns": self.turns,
+                "started": self.started,
+                "served": self.served,
+                "served_in_flight": self.served_in_flight,
+                "mismatched": self.mismatched,
+                "failed": self.failed,
+                "wasted": self.wasted,
+                "waste_rate": round(self.wasted / self.started, 4) if self.started else 0.0,
+            }
+
+
+speculation_stats = SpeculationStats()
+
+
+class SpeculativeTurn:
+    """Speculative searches started for one chat turn, claimable once per source."""
+
+    def __init__(self, query, filters, k, min_overlap):
+        self.query = query
+        self.tokens = _tokens(query)
+        self.filters = filters
+        self.k = k
+        self.min_overlap = min_overlap
+        self.futures = {}
+        self.served = set()
+        self._lock = threading.Lock()
+
+    def start(self, sources):
+        # Speculative calls see the session's team/project filters like a real tool call would
+        state_view = SimpleNamespace(state=dict(self.filters))
+        for source in sources:
+            if source in _fetchers and source not in self.futures:
+                self.futures[source] = speculation_executor.submit(
+                    _fetchers[source], self.query, k=self.k, tool_context=state_view
+                )
+        speculation_stats.add(turns=1, started=len(self.futures))
+
+    def matches(self, query, k, filters):
+        if k > self.k or filters != self.filters:
+            return False
+        if not self.tokens:
+            return False
+        # Share of the user's words the agent kept in its (usually enriched) tool query
+        overlap = len(self.tokens & _tokens(query)) / len(self.tokens)
+        return overlap >= self.min_overlap
+
+    def claim(self, source, query, k, filters):
+        with self._lock:
+            future = self.futures.get(source)
+            if future is None or source in self.served:
+                return None
+            if not self.matches(query, k, filters):
+                speculation_stats.add(mismatched=1)
+                return None
+            self.served.add(source)
+        return future
+
+    def finish(self):
+        with self._lock:
+            unused = [s for s in self.futures if s not in self.served]
+        if unused:
+            speculation_stats.add(wasted=len(unused))
+            logger.debug(f"🔮 Unused speculative searches: {unused}")
+
+
+def speculative(source):
+    """
+    Let a fetch_* tool answer from the current turn's speculative search for
+    `source`. Keeps the wrapped function's signature for ADK.
+    """
+    def decorator(func):
+        _fetchers[source] = func
+
+        @functools.wraps(func)
+        def wrapper(query: str, k: int = 3, tool_context=None):
+            turn = _current_turn.get()
+            future = turn.claim(source, query, k, session_filters(tool_context)) if turn else None
+            if future is not None:
+                in_flight = not future.done()
+                try:
+                    result = future.result()
+                except Exception:
+                    speculation_stats.add(failed=1)
+                    logger.exception(f"❌ Speculative {source} search failed; searching again")
+                else:
+                    speculation_stats.add(served=1, served_in_flight=int(in_flight))
+                    logger.info(f"🔮 Served {source} from speculative search (in flight: {in_flight})")
+                    return result[:k] if isinstance(result, list) else result
+            return func(query, k=k, tool_context=tool_context)
+
+        return wrapper
+    return decorator
+
+
+def candidate_sources(state, query):
+    """Sources worth searching ahead: the selected tools, else the local router's pick."""
+    selected = [t.lower() for t in state.get("tool", []) if t.lower() in _fetchers]
+    if selected:
+        return selected
+    decision = route_query(query)
+    return decision["sources"] if decision and not decision["fallback"] else []
+
+
+def start_speculation(state, query):
+    """Start speculative searches for a turn and make them visible to its tools."""
+    if not get_bool_setting("speculative_retrieval") or not query:
+        return None
+    sources = candidate_sources(state, query)
+    if not sources:
+        return None
+    turn = SpeculativeTurn(
+        query,
+        filters=session_filters(SimpleNamespace(state=state)),
+        k=get_int_setting("speculative_k", 5),
+        min_overlap=get_float_setting("speculative_min_overlap", 0.6),
+    )
+    started = time.perf_counter()
+    turn.start(sources)
+    logger.info(f"🔮 Speculative searches for {sources} submitted in {time.perf_counter() - started:.4f}s")
+    return turn
+
+
+def activate(turn):
+    return _current_turn.set(turn)
+
+
+def deactivate(token, turn):
+    _current_turn.reset(token)
+    if turn is not None:
+        turn.finish()
+
+
+async def iterate_with_turn(turn, events):
+    """
+    Re-enter `turn` before every step of an async event stream. Needed when each
+    step may run in its own task (e.g. Flask driving the SSE stream step by step).
+    """
+    try:
+        while True:
+            _current_turn.set(turn)
+            try:
+                event = await events.__anext__()
+            except StopAsyncIteration:
+                return
+            yield event
+    finally:
+        await events.aclose()
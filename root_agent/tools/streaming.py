@@ -0,0 +1,142 @@
+# tools/streaming.py
+"""
+Incremental readers for large source exports. Records are yielded one at a
+time from JSONL files, top-level JSON arrays, or arrays nested under a key of
+a top-level JSON object, so memory stays flat regardless of file size.
+"""
+
+import json
+from itertools import islice
+
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+READ_CHUNK_SIZE = 1 << 20  # 1 MiB
+WHITESPACE = " \t\r\n"
+
+
+class _JsonStream:
+    """Minimal pull parser over a text file: decodes one JSON value at a time."""
+
+    def __init__(self, f, chunk_size=READ_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop consumed text so the buffer never holds more than ~one record
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, or '' at end of file."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A value ending exactly at the buffer edge may be truncated (e.g. a number)
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._fill():
+                if self.eof and self.pos < len(self.buffer):
+                    continue
+                raise ValueError("Unexpected end of JSON stream")
+
+    def array_items(self):
+        """Yield the elements of the array starting at the current position."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, found {separator!r}")
+
+
+def _iter_jsonl(f):
+    for line in f:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def _iter_object_lists(stream, list_key):
+    # Walk the top-level object; stream the wanted array(s), skip everything else
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if stream.peek() == "[" and (list_key is None or key == list_key):
+            yield from stream.array_items()
+        else:
+            stream.value()
+        separator = stream.peek()
+        stream.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or '}}' in JSON object, found {separator!r}")
+
+
+def iter_json_records(path, list_key=None, chunk_size=READ_CHUNK_SIZE):
+    """
+    Yield records from `path` without loading the whole file:
+    - *.jsonl / *.ndjson: one record per line
+    - [ ... ]: each array element
+    - { "<list_key>": [ ... ] }: each element of that array
+      (every top-level array when list_key is None)
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        if path.lower().endswith(JSONL_EXTENSIONS):
+            yield from _iter_jsonl(f)
+            return
+        stream = _JsonStream(f, chunk_size=chunk_size)
+        first = stream.peek()
+        if first == "[":
+            yield from stream.array_items()
+        elif first == "{":
+            yield from _iter_object_lists(stream, list_key)
+        elif first:
+            raise ValueError(f"Unexpected JSON structure in {path}: starts with {first!r}")
+
+
+def batched(iterable, size):
+    """Yield lists of up to `size` items from `iterable`."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,41 @@
+# tools/tool_executor.py
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from root_agent.config.config_loader import get_int_setting
+
+# Bounded pool for blocking fetch_* calls (embedding + Chroma), so they never
+# stall the event loop that is waiting on model round trips.
+tool_executor = ThreadPoolExecutor(
+    max_workers=get_int_setting("tool_workers", 8),
+    thread_name_prefix="navo-tool",
+)
+
+# Separate bounded pool for multi-source fan-outs. Calls that outlive their
+# deadline keep running here, so they can only delay other fan-outs, never the
+# single-source tool calls served by tool_executor.
+fan_out_executor = ThreadPoolExecutor(
+    max_workers=get_int_setting("fan_out_workers", 8),
+    thread_name_prefix="navo-fan-out",
+)
+
+
+def offload(func):
+    """
+    Wrap a blocking tool function as a coroutine that runs in the tool pool.
+    The wrapper keeps the original signature and docstring, so ADK builds the
+    same function declaration (and still injects `tool_context`). Context
+    variables of the calling task are visible inside the pool thread.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            tool_executor, functools.partial(context.run, func, *args, **kwargs)
+        )
+
+    return wrapper
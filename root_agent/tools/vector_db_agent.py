@@ -1,23 +1,54 @@
 import os
 import json
+import hashlib
+import logging
+import time
 import chromadb
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-from llama_index.core import Document, VectorStoreIndex, StorageContext
+from llama_index.core import Document, VectorStoreIndex, StorageContext, QueryBundle
 from llama_index.vector_stores.chroma import ChromaVectorStore
 from llama_index.core.node_parser import SimpleNodeParser
+from root_agent.config.config_loader import get_int_setting, get_setting
+from root_agent.metrics import span
+from .embedding_registry import DEFAULT_EMBED_MODEL, get_embed_model, get_query_embedding
+from .result_cache import bump_generation, track_generation
+from .filters import SESSION_FILTER_KEYS, build_where, filter_key, filter_metadata, record_matches
+from .streaming import batched, iter_json_records
+
+logger = logging.getLogger(__name__)
+
+# Index modes:
+# - "build_if_empty": embed everything only when the collection is empty (default)
+# - "sync": hash every record and upsert/delete only what changed
+# - "open": never index on startup (e.g. before an explicit ingest())
+INDEX_MODES = ("build_if_empty", "sync", "open")
+
 
 class VectorDBAgent:
     MAX_METADATA_FIELD_LENGTH = 256  # Truncate metadata fields longer than this
+    ID_FIELDS = ("id", "key", "pr_id")  # Stable record identifiers, in priority order
+    RECORD_ID_KEY = "_record_id"
+    CONTENT_HASH_KEY = "_content_hash"
+    INTERNAL_METADATA_KEYS = (RECORD_ID_KEY, CONTENT_HASH_KEY)
+    INTERNAL_METADATA_PREFIX = "_"
+    CHROMA_PAGE_SIZE = 1000
+    PROGRESS_EVERY = 10000  # Log ingestion progress every N records
+    FILTER_PROBE_SIZE = 100  # Stored chunks sampled to detect pre-filter stores
+    LEGACY_FILTER_OVERFETCH = 4  # Unfiltered candidates per result when filtering in memory
 
     def __init__(
         self,
-        json_path,
         collection_name,
         persist_dir,
-        json_list_key,
         text_formatter,
-        embed_model_name="sentence-transformers/all-MiniLM-L6-v2",
+        json_path=None,
+        json_list_key=None,
+        record_loader=None,  # Callable returning records in memory; replaces json_path
+        embed_model_name=DEFAULT_EMBED_MODEL,
+        embed_device=None,
         chunk_size=2048,  # Increased chunk size to handle large metadata
+        index_mode=None,
+        id_fields=None,
+        batch_size=None,
     ):
         # Store initialization parameters
         self.json_path = json_path
@@ -25,10 +56,19 @@ class VectorDBAgent:
         self.persist_dir = persist_dir
         self.json_list_key = json_list_key
         self.text_formatter = text_formatter
+        self.record_loader = record_loader
+        if json_path is None and record_loader is None:
+            raise ValueError("VectorDBAgent needs either json_path or record_loader")
         self.chunk_size = chunk_size
+        self.id_fields = tuple(id_fields or self.ID_FIELDS)
+        self.batch_size = batch_size or get_int_setting("ingest_batch_size", 256)
+        self.index_mode = index_mode or get_setting("index_mode", "build_if_empty")
+        if self.index_mode not in INDEX_MODES:
+            raise ValueError(f"Unknown index_mode {self.index_mode!r}, expected one of {INDEX_MODES}")
 
-        # Load the embedding model for semantic search
-        self.embed_model = HuggingFaceEmbedding(model_name=embed_model_name)
+        # Shared embedding model for semantic search (one copy per process)
+        self.embed_model_name = embed_model_name
+        self.embed_model = get_embed_model(embed_model_name, device=embed_device)
 
         # Connect to (or create) the persistent Chroma vector database
         self.client = chromadb.PersistentClient(path=self.persist_dir)
@@ -39,87 +79,294 @@ class VectorDBAgent:
         # Node parser with larger chunk size
         self.node_parser = SimpleNodeParser(chunk_size=self.chunk_size, chunk_overlap=100)
 
-        # If the collection is empty, load and index data from JSON
-        if self.chroma_collection.count() == 0:
-            documents = self.load_data()
-            # Build a new vector index from the loaded documents
-            self.index = VectorStoreIndex.from_documents(
-                documents,
-                storage_context=self.storage_context,
-                embed_model=self.embed_model,
-                node_parser=self.node_parser
-            )
-        else:
-            # Otherwise, just load the existing index from the vector store
-            self.index = VectorStoreIndex.from_vector_store(
-                self.vector_store, embed_model=self.embed_model
-            )
+        # Re-indexing here or in another process invalidates the result caches
+        # (registered indexes are already tracked by register_index)
+        track_generation(self.collection_name, self.persist_dir)
 
-    def load_data(self):
-        # Load and parse the JSON data file
+        self.last_sync = None
+        self._retrievers = {}  # similarity_top_k -> retriever, reused across queries
+        self._filterable = None  # Whether stored chunks carry _filter_*/_<field>_ts metadata
+
+        # Open whatever is stored; records are streamed in fixed-size batches
+        self.index = VectorStoreIndex.from_vector_store(
+            self.vector_store, embed_model=self.embed_model
+        )
+        if self.index_mode == "sync":
+            # Upsert/delete only changed records
+            self.sync()
+        elif self.index_mode == "build_if_empty" and self.chroma_collection.count() == 0:
+            # If the collection is empty, load and index data from JSON
+            self.ingest()
+
+    def iter_records(self):
+        # In-memory adapters hand records over directly, no intermediate file
+        if self.record_loader is not None:
+            return iter(self.record_loader())
+
+        # Stream records out of the JSON data file
         if not os.path.exists(self.json_path):
             raise FileNotFoundError(f"JSON not found: {self.json_path}")
+        return iter_json_records(self.json_path, self.json_list_key)
 
-        with open(self.json_path, "r", encoding="utf-8") as f:
-            loaded = json.load(f)
-
-        # Determine which part of JSON to use
-        if self.json_list_key is None:
-            if isinstance(loaded, list):
-                data = loaded
-            elif isinstance(loaded, dict):
-                data = []
-                for v in loaded.values():
-                    if isinstance(v, list):
-                        data.extend(v)
-            else:
-                raise ValueError(f"Unexpected JSON structure in {self.json_path}: {type(loaded)}")
-        elif isinstance(loaded, dict):
-            data = loaded.get(self.json_list_key, [])
-        elif isinstance(loaded, list):
-            data = loaded
-        else:
-            raise ValueError(f"Unexpected JSON structure in {self.json_path}: {type(loaded)}")
+    def load_records(self):
+        return list(self.iter_records())
 
-        docs = []
-        for item in data:
+    def iter_documents(self, records):
+        seen_ids = {}
+        for item in records:
             # Format the text for embedding
             text = self.text_formatter(item)
 
-            # Flatten metadata and truncate long fields
-            flat_metadata = {}
-            for k, v in item.items():
-                if isinstance(v, (list, dict)):
-                    json_str = json.dumps(v, ensure_ascii=False)
-                    flat_metadata[k] = (
-                        json_str[:self.MAX_METADATA_FIELD_LENGTH] + "..."
-                        if len(json_str) > self.MAX_METADATA_FIELD_LENGTH
-                        else json_str
-                    )
+            # Flatten metadata and truncate long fields, plus filterable copies
+            flat_metadata = self.flatten_metadata(item)
+            flat_metadata.update(filter_metadata(item))
+
+            content_hash = self.content_hash(text, flat_metadata)
+            record_id = self.record_id(item, content_hash)
+            # Keep ids unique even if the source repeats an identifier
+            seen_ids[record_id] = seen_ids.get(record_id, 0) + 1
+            if seen_ids[record_id] > 1:
+                record_id = f"{record_id}#{seen_ids[record_id]}"
+            flat_metadata[self.RECORD_ID_KEY] = record_id
+            flat_metadata[self.CONTENT_HASH_KEY] = content_hash
+            internal_keys = [k for k in flat_metadata if self.is_internal_key(k)]
+
+            yield Document(
+                id_=record_id,
+                text=text,
+                metadata=flat_metadata,
+                excluded_embed_metadata_keys=internal_keys,
+                excluded_llm_metadata_keys=internal_keys,
+            )
+
+    def load_data(self):
+        return list(self.iter_documents(self.iter_records()))
+
+    def _insert_documents(self, docs):
+        # Chunk, embed (batched by the embedding model) and write to Chroma
+        nodes = self.node_parser.get_nodes_from_documents(docs)
+        self.index.insert_nodes(nodes)
+        return len(nodes)
+
+    def _log_progress(self, action, records, started):
+        elapsed = time.perf_counter() - started
+        rate = records / elapsed if elapsed > 0 else 0.0
+        logger.info(f"📥 {self.collection_name} {action}: {records} records in {elapsed:.1f}s ({rate:.1f} records/s)")
+        return elapsed, rate
+
+    def ingest(self, records=None, batch_size=None):
+        """
+        Stream records (default: this agent's source) through formatting,
+        embedding and Chroma insertion in fixed-size batches, so peak memory
+        is bounded by one batch. Returns record/chunk counts and throughput.
+        """
+        batch_size = batch_size or self.batch_size
+        records = self.iter_records() if records is None else records
+        started = time.perf_counter()
+        total_records = total_chunks = 0
+        next_progress = self.PROGRESS_EVERY
+
+        for docs in batched(self.iter_documents(records), batch_size):
+            total_chunks += self._insert_documents(docs)
+            total_records += len(docs)
+            if total_records >= next_progress:
+                self._log_progress("ingest", total_records, started)
+                next_progress += self.PROGRESS_EVERY
+
+        elapsed, rate = self._log_progress("ingest done", total_records, started)
+        if total_records:
+            self._filterable = None
+            bump_generation(self.collection_name)
+        return {
+            "records": total_records,
+            "chunks": total_chunks,
+            "seconds": round(elapsed, 3),
+            "records_per_second": round(rate, 1),
+        }
+
+    @classmethod
+    def is_internal_key(cls, key):
+        # Record ids, hashes and filter/timestamp copies never reach the LLM
+        return key in cls.INTERNAL_METADATA_KEYS or key.startswith(cls.INTERNAL_METADATA_PREFIX)
+
+    @classmethod
+    def flatten_metadata(cls, item):
+        flat_metadata = {}
+        for k, v in item.items():
+            if isinstance(v, (list, dict)):
+                json_str = json.dumps(v, ensure_ascii=False)
+                flat_metadata[k] = (
+                    json_str[:cls.MAX_METADATA_FIELD_LENGTH] + "..."
+                    if len(json_str) > cls.MAX_METADATA_FIELD_LENGTH
+                    else json_str
+                )
+            else:
+                str_v = str(v)
+                flat_metadata[k] = (
+                    str_v[:cls.MAX_METADATA_FIELD_LENGTH] + "..."
+                    if len(str_v) > cls.MAX_METADATA_FIELD_LENGTH
+                    else str_v
+                )
+        return flat_metadata
+
+    def record_id(self, item, content_hash):
+        # First non-empty identifier field, else fall back to the content hash
+        for field in self.id_fields:
+            value = item.get(field)
+            if value not in (None, ""):
+                return str(value)
+        return f"sha256:{content_hash}"
+
+    @staticmethod
+    def content_hash(text, metadata):
+        payload = json.dumps({"text": text, "metadata": metadata}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _indexed_records(self):
+        """
+        Page through the collection and return ({record_id: content_hash}, untracked_chunk_ids).
+        Chunks without a record id were written before content hashing existed.
+        """
+        hashes = {}
+        untracked = []
+        offset = 0
+        while True:
+            page = self.chroma_collection.get(
+                include=["metadatas"], limit=self.CHROMA_PAGE_SIZE, offset=offset
+            )
+            ids = page.get("ids") or []
+            for chunk_id, metadata in zip(ids, page.get("metadatas") or []):
+                record_id = (metadata or {}).get(self.RECORD_ID_KEY)
+                if record_id is None:
+                    untracked.append(chunk_id)
                 else:
-                    str_v = str(v)
-                    flat_metadata[k] = (
-                        str_v[:self.MAX_METADATA_FIELD_LENGTH] + "..."
-                        if len(str_v) > self.MAX_METADATA_FIELD_LENGTH
-                        else str_v
-                    )
+                    hashes[record_id] = metadata.get(self.CONTENT_HASH_KEY)
+            if len(ids) < self.CHROMA_PAGE_SIZE:
+                return hashes, untracked
+            offset += len(ids)
+
+    def _delete_records(self, record_ids):
+        record_ids = list(record_ids)
+        for i in range(0, len(record_ids), self.CHROMA_PAGE_SIZE):
+            batch = record_ids[i:i + self.CHROMA_PAGE_SIZE]
+            self.chroma_collection.delete(where={self.RECORD_ID_KEY: {"$in": batch}})
 
-            docs.append(Document(text=text, metadata=flat_metadata))
+    def sync(self):
+        """
+        Incrementally re-index: embed and upsert only new or changed records,
+        delete records that disappeared from the source, keep the rest.
+        Returns counts of added, updated, deleted and unchanged records.
+        """
+        indexed, untracked = self._indexed_records()
+        counts = {"added": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        seen = set()
+        started = time.perf_counter()
+        next_progress = self.PROGRESS_EVERY
 
-        return docs
+        if untracked:
+            # Pre-hash chunks can't be matched to records; replace them wholesale
+            logger.info(f"🧹 {self.collection_name}: dropping {len(untracked)} untracked chunks")
+            for i in range(0, len(untracked), self.CHROMA_PAGE_SIZE):
+                self.chroma_collection.delete(ids=untracked[i:i + self.CHROMA_PAGE_SIZE])
 
-    def query(self, query, top_k=3):
+        for docs in batched(self.iter_documents(self.iter_records()), self.batch_size):
+            changed_docs = []
+            stale_ids = []
+            for doc in docs:
+                record_id = doc.metadata[self.RECORD_ID_KEY]
+                seen.add(record_id)
+                previous_hash = indexed.get(record_id)
+                if previous_hash == doc.metadata[self.CONTENT_HASH_KEY]:
+                    counts["unchanged"] += 1
+                    continue
+                if record_id in indexed:
+                    counts["updated"] += 1
+                    stale_ids.append(record_id)
+                else:
+                    counts["added"] += 1
+                changed_docs.append(doc)
+            self._delete_records(stale_ids)
+            if changed_docs:
+                self._insert_documents(changed_docs)
+            if len(seen) >= next_progress:
+                self._log_progress("sync", len(seen), started)
+                next_progress += self.PROGRESS_EVERY
+
+        removed = [record_id for record_id in indexed if record_id not in seen]
+        counts["deleted"] = len(removed)
+        self._delete_records(removed)
+
+        if counts["added"] or counts["updated"] or removed or untracked:
+            self._filterable = None
+            bump_generation(self.collection_name)
+
+        self.last_sync = counts
+        logger.info(f"🔄 {self.collection_name} sync: {counts}")
+        return counts
+
+    def has_filter_metadata(self):
+        """
+        False for stores indexed before the current filter metadata: a sampled
+        chunk lacks a _filter_<team/project> key (every record now stores one,
+        UNSCOPED when it has no value), so a `where` clause would miss it.
+        A sync re-embeds them with it.
+        """
+        if self._filterable is None:
+            page = self.chroma_collection.get(include=["metadatas"], limit=self.FILTER_PROBE_SIZE)
+            metadatas = [metadata or {} for metadata in page.get("metadatas") or []]
+            self._filterable = all(
+                filter_key(field) in metadata
+                for metadata in metadatas for field in SESSION_FILTER_KEYS
+            )
+            if not self._filterable:
+                logger.warning(
+                    f"⚠️ {self.collection_name} was indexed without current filter metadata; filtering results "
+                    f"in memory until it is re-indexed (python -m root_agent.tools.reindex {self.collection_name})"
+                )
+        return self._filterable
+
+    def query(self, query, top_k=3, filters=None):
+        """
+        Semantic search, optionally narrowed by structured filters
+        (team, project, status, type, priority, created_after/_before, ...)
+        that are pushed down into a Chroma `where` clause.
+        """
         if not query:
             return {"error": "Please provide a query."}
 
-        retriever = self.index.as_retriever(similarity_top_k=top_k)
-        results = retriever.retrieve(query)
+        where = build_where(filters)
+        legacy_filters = None
+        if where is not None and not self.has_filter_metadata():
+            # Search unfiltered and match the stored (flattened) fields instead
+            legacy_filters = filters
+            retriever = self.index.as_retriever(similarity_top_k=top_k * self.LEGACY_FILTER_OVERFETCH)
+        elif where is None:
+            retriever = self._retrievers.get(top_k)
+            if retriever is None:
+                retriever = self._retrievers.setdefault(
+                    top_k, self.index.as_retriever(similarity_top_k=top_k)
+                )
+        else:
+            retriever = self.index.as_retriever(
+                similarity_top_k=top_k, vector_store_kwargs={"where": where}
+            )
+        # Query vectors come from the shared LRU, so retries and the same
+        # query across collections are only embedded once
+        embedding = get_query_embedding(self.embed_model_name, self.embed_model, query)
+        with span("vector_search", self.collection_name):
+            results = retriever.retrieve(QueryBundle(query_str=query, embedding=embedding))
 
         response = []
         for r in results:
+            metadata = {
+                k: v for k, v in r.node.metadata.items()
+                if not self.is_internal_key(k)
+            }
+            if legacy_filters is not None and not record_matches(metadata, legacy_filters):
+                continue
             response.append({
                 "text": r.node.text,
                 "score": r.score,
-                "metadata": r.node.metadata
+                "metadata": metadata
             })
-        return response
+        return response[:top_k]
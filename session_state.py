@@ -0,0 +1,151 @@
+"""
+Helpers that keep long-lived sessions (e.g. a CLI open all day) cheap per turn:
+a bounded interaction history that can spill old entries to disk, and a state
+sync that only writes the keys that changed since the last sync.
+"""
+import copy
+import json
+import os
+import threading
+import weakref
+from collections import deque
+
+from google.adk.events import Event, EventActions
+from root_agent.config.config_loader import get_int_setting, get_setting
+
+HISTORY_KEY = "interaction_history"
+# Total interactions ever recorded (the history itself only keeps the latest ones)
+COUNT_KEY = "interaction_count"
+DEFAULT_HISTORY_SIZE = 50
+
+
+class InteractionHistory:
+    """
+    Ring buffer of the latest `max_entries` interactions, stored in session
+    state as a deque. Entries pushed out are appended to a JSONL archive when
+    `archive_path` is set (NAVO_HISTORY_ARCHIVE_DIR), otherwise dropped.
+    """
+
+    _archive_lock = threading.Lock()
+
+    def __init__(self, state, max_entries=None, archive_path=None):
+        self.state = state
+        self.max_entries = max_entries or get_int_setting("history_max_entries", DEFAULT_HISTORY_SIZE)
+        self.archive_path = archive_path
+        entries = state.get(HISTORY_KEY) or []
+        if not isinstance(entries, deque) or entries.maxlen != self.max_entries:
+            # Adopt a plain list (e.g. the initial state) or a buffer with a different cap
+            overflow = list(entries)[:-self.max_entries] if len(entries) > self.max_entries else []
+            self._archive(overflow)
+            entries = deque(entries, maxlen=self.max_entries)
+            state[HISTORY_KEY] = entries
+        self.entries = entries
+        state.setdefault(COUNT_KEY, len(entries))
+
+    @classmethod
+    def for_session(cls, session, max_entries=None):
+        archive_dir = get_setting("history_archive_dir")
+        archive_path = None
+        if archive_dir:
+            archive_path = os.path.join(
+                archive_dir, f"{session.app_name}_{session.user_id}_{session.id}.jsonl"
+            )
+        return cls(session.state, max_entries=max_entries, archive_path=archive_path)
+
+    def _archive(self, entries):
+        if not entries or not self.archive_path:
+            return
+        with self._archive_lock:
+            os.makedirs(os.path.dirname(self.archive_path) or ".", exist_ok=True)
+            with open(self.archive_path, "a", encoding="utf-8") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+
+    def append(self, entry):
+        if len(self.entries) == self.max_entries:
+            self._archive([self.entries[0]])
+        self.entries.append(entry)
+        self.state[COUNT_KEY] = self.state.get(COUNT_KEY, 0) + 1
+
+    def clear(self):
+        self.entries.clear()
+        self.state[COUNT_KEY] = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+
+def interaction_count(state):
+    return state.get(COUNT_KEY, len(state.get(HISTORY_KEY) or []))
+
+
+class StateSync:
+    """
+    Pushes locally owned session states into the session service, writing
+    only the keys whose values changed since that session's previous sync. Writes go
+    through a state-delta event, so they persist in the stored session without
+    a get_session() deep copy. A state delta cannot remove a key, so keys
+    popped locally are written as None, which readers treat as unset.
+    """
+
+    def __init__(self, session_service):
+        self.session_service = session_service
+        # (app_name, user_id, session_id) -> {key: value as last synced}
+        self._synced = {}
+
+    @staticmethod
+    def session_key(session):
+        return (session.app_name, session.user_id, session.id)
+
+    def snapshot(self, session):
+        """What this session's state looked like at its last sync."""
+        return self._synced.setdefault(self.session_key(session), {})
+
+    def changed_keys(self, session):
+        synced = self.snapshot(session)
+        return [
+            key for key, value in session.state.items()
+            if key not in synced or synced[key] != value
+        ]
+
+    def removed_keys(self, session):
+        return [key for key in self.snapshot(session) if key not in session.state]
+
+    def sync(self, session, keys=None):
+        """Write the changed and removed keys (optionally restricted to `keys`); returns the delta."""
+        changed = self.changed_keys(session)
+        removed = self.removed_keys(session)
+        if keys is not None:
+            changed = [key for key in changed if key in keys]
+            removed = [key for key in removed if key in keys]
+        if not changed and not removed:
+            return {}
+        delta = {key: session.state[key] for key in changed}
+        delta.update({key: None for key in removed})
+        # Serializable copies for the stored session; snapshots to diff against next time
+        stored_delta = {
+            key: list(value) if isinstance(value, deque) else value for key, value in delta.items()
+        }
+        # An empty shell with the same ids: append_event would otherwise also
+        # apply the delta to (and record the event on) the caller's session
+        shell = session.model_copy(update={"state": {}, "events": []})
+        self.session_service.append_event(
+            shell, Event(author="user", actions=EventActions(state_delta=stored_delta))
+        )
+        synced = self.snapshot(session)
+        for key in changed:
+            synced[key] = copy.copy(delta[key])
+        for key in removed:
+            del synced[key]
+        return delta
+
+
+_state_syncs = weakref.WeakKeyDictionary()
+
+
+def state_sync_for(session_service):
+    """The StateSync bound to `session_service` (one per service, created on first use)."""
+    sync = _state_syncs.get(session_service)
+    if sync is None:
+        sync = _state_syncs[session_service] = StateSync(session_service)
+    return sync
@@ -0,0 +1,159 @@
+"""
+Per-user sessions for the web apps. Sessions live in the ADK session service;
+this store tracks which ones are resident, their approximate size, and evicts
+the least recently used ones once the entry or byte cap is exceeded.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+DEFAULT_SESSION_ID = "default"
+DEFAULT_MAX_SESSION_BYTES = 256 * 1024 * 1024
+
+
+def estimate_session_bytes(session):
+    """Approximate resident size of a session (state + events) as serialized JSON."""
+    try:
+        return len(session.model_dump_json())
+    except Exception:
+        return len(str(session.state)) + sum(len(str(event)) for event in session.events)
+
+
+def prune_session_events(session_service, app_name, user_id, session_id):
+    """
+    Drop the stored events of a session (its state is kept). Used once their
+    content has been folded into conversation memory. InMemorySessionService
+    has no API for this, so the stored session is edited directly.
+    """
+    stored = (
+        getattr(session_service, "sessions", {})
+        .get(app_name, {})
+        .get(user_id, {})
+        .get(session_id)
+    )
+    if stored is not None:
+        stored.events.clear()
+
+
+class SessionStore:
+    """
+    LRU index over sessions held by `session_service`, keyed by (user_id, session_id).
+    `max_sessions` / `max_bytes` <= 0 disable the respective cap. The session
+    being recorded and sessions held with in_use() (mid-turn) are never evicted.
+    """
+
+    def __init__(self, session_service, app_name, initial_state, max_sessions=1000, max_bytes=0):
+        self.session_service = session_service
+        self.app_name = app_name
+        self.initial_state = initial_state
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self._sizes = OrderedDict()
+        self._in_use = {}  # (user_id, session_id) -> turns currently running in it
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+    def get_or_create(self, user_id, session_id=None):
+        """Return the stored session, creating it (with the initial state) on first use."""
+        session_id = session_id or DEFAULT_SESSION_ID
+        key = (user_id, session_id)
+        session = self.session_service.get_session(
+            app_name=self.app_name, user_id=user_id, session_id=session_id
+        )
+        if session is None:
+            session = self.session_service.create_session(
+                app_name=self.app_name,
+                user_id=user_id,
+                session_id=session_id,
+                state=dict(self.initial_state),
+            )
+            logging.info(f"🔹 Session created for user {user_id} with ID: {session.id}")
+        with self._lock:
+            if key in self._sizes:
+                self.hits += 1
+                self._sizes.move_to_end(key)
+            else:
+                self.misses += 1
+        self.record(session)
+        return session
+
+    def record(self, session):
+        """Refresh the size and recency of `session`, then enforce the caps."""
+        key = (session.user_id, session.id)
+        size = estimate_session_bytes(session)
+        with self._lock:
+            self._total_bytes += size - self._sizes.get(key, 0)
+            self._sizes[key] = size
+            self._sizes.move_to_end(key)
+            evicted = self._pop_over_limit(protect=key)
+        for (user_id, session_id), _ in evicted:
+            self.session_service.delete_session(
+                app_name=self.app_name, user_id=user_id, session_id=session_id
+            )
+        if evicted:
+            logging.info(f"🧹 Evicted {len(evicted)} idle session(s): {[k for k, _ in evicted]}")
+
+    def acquire(self, session):
+        key = (session.user_id, session.id)
+        with self._lock:
+            self._in_use[key] = self._in_use.get(key, 0) + 1
+
+    def release(self, session):
+        key = (session.user_id, session.id)
+        with self._lock:
+            count = self._in_use.get(key, 0) - 1
+            if count > 0:
+                self._in_use[key] = count
+            else:
+                self._in_use.pop(key, None)
+
+    @contextmanager
+    def in_use(self, session):
+        """Keep `session` from being evicted while a turn runs in it."""
+        self.acquire(session)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    def prune_events(self, session):
+        prune_session_events(self.session_service, self.app_name, session.user_id, session.id)
+
+    def _over_limit(self):
+        if self.max_sessions > 0 and len(self._sizes) > self.max_sessions:
+            return True
+        return self.max_bytes > 0 and self._total_bytes > self.max_bytes
+
+    def _pop_over_limit(self, protect):
+        evicted = []
+        for key in list(self._sizes):
+            if not self._over_limit():
+                break
+            if key == protect or key in self._in_use:
+                # Still being served; the caps are enforced again on the next record()
+                continue
+            size = self._sizes.pop(key)
+            self._total_bytes -= size
+            self.evictions += 1
+            self.evicted_bytes += size
+            evicted.append((key, size))
+        return evicted
+
+    def stats(self):
+        with self._lock:
+            return {
+                "sessions": len(self._sizes),
+                "in_use": len(self._in_use),
+                "bytes": self._total_bytes,
+                "max_sessions": self.max_sessions,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "evicted_bytes": self.evicted_bytes,
+            }
@@ -0,0 +1,40 @@
+# tests/test_filters.py
+"""Session team/project filters must not hide records that have no team/project."""
+
+import json
+import os
+from types import SimpleNamespace
+
+from root_agent.tools.filters import UNSCOPED, build_where, filter_metadata, record_matches, session_filters
+
+GITHUB_DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "github", "github.json")
+
+
+def sample_repo_files():
+    """Files of the sample repo block (airfreight-cargo-db), which has no team or project."""
+    with open(GITHUB_DATA_PATH, encoding="utf-8") as f:
+        blocks = json.load(f)
+    repo = next(block for block in blocks if block.get("repo") == "airfreight-cargo-db")
+    assert "team" not in repo and "project" not in repo
+    return repo["files"]
+
+
+def team_session_filters():
+    return session_filters(SimpleNamespace(state={"team": "Team001", "project": "", "tool": []}))
+
+
+def test_team_scoped_session_still_gets_sample_repo_files():
+    files = sample_repo_files()
+    filters = team_session_filters()
+    assert files and all(record_matches(file, filters) for file in files)
+
+
+def test_session_filter_where_clause_matches_unscoped_records():
+    assert build_where(team_session_filters()) == {"_filter_team": {"$in": ["team001", UNSCOPED]}}
+    assert filter_metadata(sample_repo_files()[0])["_filter_team"] == UNSCOPED
+
+
+def test_explicit_filters_stay_strict():
+    assert not record_matches(sample_repo_files()[0], {"team": "Team001"})
+    assert not record_matches({"team": "Team002"}, team_session_filters())
+    assert record_matches({"team": "team001"}, team_session_filters())
@@ -1,4 +1,5 @@
 from datetime import datetime
+from session_state import InteractionHistory, interaction_count
 
 # ANSI color codes for terminal output
 class Colors:
@@ -73,7 +74,7 @@ def display_system_status(session):
     print(f"Current Agent: {session.state.get('current_agent', 'Unknown')}")
     print(f"System Status: {session.state.get('system_status', 'Unknown')}")
     print(f"Error Count: {session.state.get('error_count', 0)}")
-    print(f"Interactions: {len(session.state.get('interaction_history', []))}")
+    print(f"Interactions: {interaction_count(session.state)}")
     print(f"{Colors.ENDC}")
 
 def handle_system_commands(command, session, session_service, app_name, user_id, session_id):
@@ -87,8 +88,9 @@ def handle_system_commands(command, session, session_service, app_name, user_id,
         display_system_status(session)
         return True
     elif command == "clear":
-        session.state["interaction_history"] = []
+        InteractionHistory.for_session(session).clear()
         session.state["conversation_context"] = []
+        session.state.pop("conversation_memory", None)
         print(f"{Colors.GREEN}✅ Conversation history cleared.{Colors.ENDC}")
         return True
     elif command in ["logged in", "login done", "login complete", "logged"]: